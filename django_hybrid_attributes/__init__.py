@@ -1,9 +1,13 @@
-from .core import HybridExpression, HybridExpressionResult  # noqa
-from .decorators import hybrid_method, hybrid_property  # noqa
+from .core import HybridExpression, HybridExpressionResult, HybridExpressionVariants  # noqa
+from .decorators import hybrid_aggregate, hybrid_method, hybrid_property  # noqa
 from .managers import HybridManager, HybridManagerMixin, HybridQuerySet, HybridQuerySetMixin  # noqa
+from .prefetch import HybridPrefetch  # noqa
+from .projections import HybridProjection  # noqa
 
 __all__ = [
-    'hybrid_method', 'hybrid_property',
+    'hybrid_aggregate', 'hybrid_method', 'hybrid_property',
     'HybridManager', 'HybridManagerMixin', 'HybridQuerySet', 'HybridQuerySetMixin',
-    'HybridExpression', 'HybridExpressionResult',
+    'HybridExpression', 'HybridExpressionResult', 'HybridExpressionVariants',
+    'HybridPrefetch',
+    'HybridProjection',
 ]
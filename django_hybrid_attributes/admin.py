@@ -0,0 +1,145 @@
+import inspect
+
+from django.contrib import admin
+from django.core.exceptions import FieldError, ImproperlyConfigured
+from django.db import models
+
+from .core import _hybrid_value_alias, annotate_hybrid_lookups
+from .decorators import hybrid_method, hybrid_property
+from .managers import HybridQuerySetMixin
+from .prefetch import _resolve_hybrids, annotate_hybrid_values
+
+_DISPLAY_ATTRIBUTES = ('short_description', 'empty_value_display', 'boolean')
+
+
+def _takes_arguments(func):
+    parameters = list(inspect.signature(func).parameters.values())[1:]  # Skipping `self`
+    return any(x.default is x.empty and x.kind not in (x.VAR_POSITIONAL, x.VAR_KEYWORD) for x in parameters)
+
+
+def _has_boolean_output(model, hybrid_expression):
+    try:
+        queryset = model._default_manager.annotate(_hybrid_output=hybrid_expression.expression())
+        return isinstance(queryset.query.annotations['_hybrid_output'].output_field, models.BooleanField)
+    except FieldError:
+        return False
+
+
+class HybridAdminMixin(object):
+    """ModelAdmin mixin computing the hybrid attributes of `list_display` in SQL.
+
+    Every hybrid property (or hybrid method without arguments) of `list_display` is annotated to the changelist queryset,
+    so rows read their values instead of computing them in Python (one query per row, for hybrids which query other
+    tables). These columns are sortable (by their annotations) and boolean hybrids are displayed as icons.
+    `short_description`, `empty_value_display` and `boolean` set on the hybrid function are honoured. Hybrid methods
+    taking arguments can't be displayed, so they raise `ImproperlyConfigured`.
+
+    Note only the `list_display` class attribute is inspected (not `get_list_display()`), and admin attributes with the
+    same name as a hybrid take precedence over it.
+
+    :Example:
+    >>> @admin.register(Student)
+    ... class StudentAdmin(HybridAdminMixin, admin.ModelAdmin):
+    ...     list_display = ('first_name', 'full_name', 'get_status', 'average_grade')
+    ...     list_filter = (HybridListFilter.create(Student.get_status(), ['passed', 'failed']),)
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.list_display_hybrids = {}
+        for name in self.list_display:
+            if not isinstance(name, str) or hasattr(type(self), name):
+                continue
+            descriptor = inspect.getattr_static(self.model, name, None)
+            if isinstance(descriptor, hybrid_method):
+                if _takes_arguments(descriptor.func):
+                    raise ImproperlyConfigured(
+                        f'{type(self).__name__}.list_display: hybrid method "{name}" takes arguments, so it can\'t be '
+                        f'displayed. Add an admin method which calls it with the arguments to be displayed instead.'
+                    )
+                hybrid_expression = _resolve_hybrids([getattr(self.model, name)])[0]
+                self.list_display_hybrids[name] = hybrid_expression
+                setattr(self, name, self._hybrid_display(name, descriptor, hybrid_expression))
+
+    def _hybrid_display(self, name, descriptor, hybrid_expression):
+        is_property = isinstance(descriptor, hybrid_property)
+
+        def display(obj):
+            value = getattr(obj, name)
+            return value if is_property else value()
+
+        display.__name__ = name
+        display.admin_order_field = _hybrid_value_alias(
+            hybrid_expression.name, hybrid_expression.callable_args, hybrid_expression.callable_kwargs,
+        )
+        display.boolean = _has_boolean_output(self.model, hybrid_expression)
+        for attribute in _DISPLAY_ATTRIBUTES:
+            if hasattr(descriptor.func, attribute):
+                setattr(display, attribute, getattr(descriptor.func, attribute))
+        return display
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.list_display_hybrids:
+            queryset = annotate_hybrid_values(queryset, self.list_display_hybrids.values())
+        return queryset
+
+
+class HybridListFilter(admin.SimpleListFilter):
+    """Changelist filter whose choices are hybrid comparisons, applied in SQL.
+
+    Subclasses define `title`, `parameter_name` and `comparisons`: a sequence of `(value, label, comparison)`, where
+    `comparison` is any hybrid comparison (or `Q` object combining them). `create()` builds one from a hybrid and the
+    values it should equal.
+
+    :Example:
+    >>> class GradeFilter(HybridListFilter):
+    ...     title = 'average grade'
+    ...     parameter_name = 'grade'
+    ...     comparisons = (
+    ...         ('good', 'Good', Student.average_grade >= 7),
+    ...         ('bad', 'Bad', Student.average_grade < 7),
+    ...     )
+
+    """
+
+    comparisons = ()
+
+    @classmethod
+    def create(cls, hybrid_expression, values, title=None, parameter_name=None):
+        """Build a filter matching a hybrid against each of the given values.
+
+        :param hybrid_expression: class-level hybrid attribute (hybrid methods must be called).
+        :param values: values to be matched, or `(value, label)` pairs.
+        :param title: [optional] title of the filter. Defaults to the hybrid name.
+        :param parameter_name: [optional] query string parameter. Defaults to the hybrid name.
+
+        :Example:
+        >>> HybridListFilter.create(Student.get_status(), [('passed', 'Passed'), ('failed', 'Failed')])
+
+        """
+        comparisons = []
+        for value in values:
+            value, label = value if isinstance(value, (list, tuple)) else (value, value)
+            comparisons.append((str(value), label, hybrid_expression == value))
+
+        name = hybrid_expression.name
+        return type(f'{name.title().replace("_", "")}HybridListFilter', (cls,), {
+            'title': title or name.replace('_', ' '),
+            'parameter_name': parameter_name or name,
+            'comparisons': tuple(comparisons),
+        })
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, label, _ in self.comparisons]
+
+    def queryset(self, request, queryset):
+        comparisons = {value: comparison for value, _, comparison in self.comparisons}
+        comparison = comparisons.get(self.value())
+        if comparison is None:
+            return queryset
+        if isinstance(queryset, HybridQuerySetMixin):
+            return queryset.filter(comparison)
+        queryset, (comparison,) = annotate_hybrid_lookups(queryset, comparison)
+        return queryset.filter(comparison)
@@ -0,0 +1,112 @@
+import hashlib
+import re
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .explain import _sql_relations
+
+CACHE_KEY_PREFIX = 'django_hybrid_attributes'
+
+M2M_CHANGED_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+
+def _version_key(model):
+    return f'{CACHE_KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def _invalidate_model(sender, **kwargs):
+    # Every process (not only those which evaluated cached querysets) must invalidate them, so the version is changed in
+    # every configured cache. Deleting it is enough (a new one is created on next use) and adds no keys for other models.
+    version_key = _version_key(sender)
+    for cache_alias in settings.CACHES:
+        caches[cache_alias].delete(version_key)
+
+
+def _invalidate_m2m(sender, action, **kwargs):
+    # The sender is the intermediary model, whose table is the one referenced by queries through the relation
+    if action in M2M_CHANGED_ACTIONS:
+        _invalidate_model(sender)
+
+
+post_save.connect(_invalidate_model, dispatch_uid='django_hybrid_attributes.cache')
+post_delete.connect(_invalidate_model, dispatch_uid='django_hybrid_attributes.cache')
+m2m_changed.connect(_invalidate_m2m, dispatch_uid='django_hybrid_attributes.cache')
+
+
+def _dependent_models(queryset, sql):
+    """Models whose tables are referenced by the queryset SQL (including joins and subqueries of hybrid expressions)."""
+    relations = _sql_relations(sql)
+    dependent = {queryset.model}
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.db_table.lower() in relations:
+            dependent.add(model)
+    return sorted(dependent, key=lambda x: x._meta.label_lower)
+
+
+def _hybrid_signature(queryset):
+    """Normalized signature of the hybrids applied to a queryset: identity, arguments and `through` path."""
+    return sorted((*x._signature(), x.through_path) for x in queryset._hybrid_aliases.values())
+
+
+def _normalize_sql(queryset, sql):
+    # Hybrid aliases are random by default: replace them (in order of appearance) so equivalent querysets share a key.
+    aliases = [x for x in queryset._hybrid_aliases if x in sql]
+    aliases.sort(key=sql.index)
+    for index, alias in enumerate(aliases):
+        sql = re.sub(rf'\b{re.escape(alias)}\b', f'__hybrid_{index}', sql)
+    return sql
+
+
+def _get_versions(cache, models):
+    version_keys = [_version_key(x) for x in models]
+    versions = cache.get_many(version_keys)
+    for version_key in version_keys:
+        if version_key not in versions:
+            cache.add(version_key, uuid.uuid4().hex, None)
+            versions[version_key] = cache.get(version_key)
+    return [versions[x] for x in version_keys]
+
+
+def get_cache_key(queryset, cache_alias='default'):
+    """Cache key of a queryset results, as used by `HybridQuerySetMixin.cached()`.
+
+    The key is made of the normalized hybrid signature and SQL of the queryset, plus the current version of every model
+    the queryset depends on. Versions change whenever an instance of these models is saved or deleted (or, for
+    intermediary models of many-to-many relations, when the relation is changed), by any process using this package.
+
+    """
+    sql, params = queryset.query.sql_with_params()
+    models = _dependent_models(queryset, sql)
+    versions = _get_versions(caches[cache_alias], models)
+    iterable_class = queryset._iterable_class
+    signature = repr((
+        queryset.db,
+        f'{iterable_class.__module__}.{iterable_class.__qualname__}',
+        _hybrid_signature(queryset),
+        _normalize_sql(queryset, sql),
+        params,
+        versions,
+    ))
+    return f'{CACHE_KEY_PREFIX}:queryset:{hashlib.md5(signature.encode()).hexdigest()}'
+
+
+def get_cached_results(queryset, cache_alias, timeout):
+    """Get the results of a queryset from cache, evaluating (and caching) them in case of a miss."""
+    cache = caches[cache_alias]
+
+    try:
+        cache_key = get_cache_key(queryset, cache_alias)
+    except EmptyResultSet:
+        return list(queryset._iterable_class(queryset))
+
+    missing = object()
+    results = cache.get(cache_key, missing)
+    if results is missing:
+        results = list(queryset._iterable_class(queryset))
+        cache.set(cache_key, results, timeout)
+    return results
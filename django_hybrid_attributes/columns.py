@@ -0,0 +1,140 @@
+import array
+import math
+
+from django.db import connections
+from django.db.models.sql.constants import MULTI
+
+from .core import HybridExpression
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+BACKEND_ARRAY = 'array'
+BACKEND_NUMPY = 'numpy'
+
+_INTEGER_TYPES = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'PositiveBigIntegerField',
+}
+_FLOAT_TYPES = {'FloatField', 'DecimalField'}
+_BOOLEAN_TYPES = {'BooleanField'}
+
+_NUMPY_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'bool'}
+
+
+def _typecode(output_field):
+    """`array` typecode for values of a field, or None when they can't be stored in a typed array (strings, dates...)."""
+    while output_field.is_relation:
+        output_field = output_field.target_field
+    internal_type = output_field.get_internal_type()
+    if internal_type in _INTEGER_TYPES:
+        return 'q'
+    if internal_type in _FLOAT_TYPES:
+        return 'd'
+    if internal_type in _BOOLEAN_TYPES:
+        return 'b'
+    return None
+
+
+class _Column(object):
+    """Preallocated buffer of a single column, written one chunk of values at a time."""
+
+    def __init__(self, name, typecode, size, backend):
+        self.name = name
+        self.typecode = typecode
+        self.backend = backend
+        self.buffer = self._allocate(size)
+
+    def _allocate(self, size):
+        if self.backend == BACKEND_NUMPY:
+            return numpy.zeros(size, dtype=_NUMPY_DTYPES.get(self.typecode, object))
+        if self.typecode is None:
+            return [None] * size
+        return array.array(self.typecode, bytes(array.array(self.typecode).itemsize * size))
+
+    def _clean(self, values):
+        if self.typecode is None or None not in values:
+            return values
+        if self.typecode == 'd':
+            return [math.nan if x is None else x for x in values]
+        raise ValueError(
+            f'Column "{self.name}" contains NULL values, which cannot be stored in a typed array. '
+            f'Wrap its expression with Coalesce() or use a nullable output_field (a FloatField, for instance).'
+        )
+
+    def write(self, position, values):
+        values = self._clean(values)
+        end = position + len(values)
+        if end > len(self.buffer):  # Rows were inserted after the count
+            self.resize(end)
+        if self.backend == BACKEND_ARRAY and self.typecode is not None:
+            values = array.array(self.typecode, values)
+        self.buffer[position:end] = values
+
+    def resize(self, size):
+        if len(self.buffer) > size:
+            self.buffer = self.buffer[:size]
+        elif len(self.buffer) < size:
+            extra = self._allocate(size - len(self.buffer))
+            self.buffer = numpy.concatenate([self.buffer, extra]) if self.backend == BACKEND_NUMPY else self.buffer + extra
+
+
+def export_columns(queryset, columns, backend=BACKEND_ARRAY, chunk_size=2000):
+    """Export hybrid values (and fields) of a queryset as columns, in typed arrays.
+
+    Most likely you want to use `HybridQuerySetMixin.to_columns()` instead.
+
+    :param queryset: queryset whose rows are exported.
+    :param columns: class-level hybrid attributes (or field names) to be exported.
+    :param backend: [optional] 'array' (stdlib `array.array`) or 'numpy' (`numpy.ndarray`). Defaults to 'array'.
+    :param chunk_size: [optional] number of rows fetched from the database cursor at a time. Defaults to 2000.
+    :rtype: dict
+
+    """
+    if backend not in (BACKEND_ARRAY, BACKEND_NUMPY):
+        raise ValueError(f'Unknown backend "{backend}", use "{BACKEND_ARRAY}" or "{BACKEND_NUMPY}"')
+    if backend == BACKEND_NUMPY and numpy is None:
+        raise ImportError('NumPy is required to export columns with the "numpy" backend')
+
+    names = []
+    annotations = {}
+    for column in columns:
+        if not isinstance(column, HybridExpression):
+            names.append(column)
+            continue
+        name = column.alias or column.name
+        if name in annotations:
+            raise ValueError(f'Column "{name}" is exported more than once, give each of them a different alias via `.a()`')
+        annotations[name] = column
+        names.append(name)
+
+    queryset = queryset.annotate(**annotations).values_list(*names)
+    size = queryset.count()
+
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    connection = connections[queryset.db]
+    chunked_fetch = connection.features.can_use_chunked_reads and not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+    chunks = compiler.execute_sql(MULTI, chunked_fetch=chunked_fetch, chunk_size=chunk_size)
+
+    # Fields are selected before annotations, whatever the order they were asked for (like `ValuesListIterable` does)
+    select_names = [*query.extra_select, *query.values_select, *query.annotation_select]
+    indexes = [select_names.index(x) for x in names]
+    expressions = [compiler.select[x][0] for x in indexes]
+    converters = compiler.get_converters([x[0] for x in compiler.select[:len(select_names)]])
+    columns = [_Column(name, _typecode(x.output_field), size, backend) for name, x in zip(names, expressions)]
+
+    position = 0
+    for rows in chunks:
+        if converters:
+            rows = list(compiler.apply_converters(rows, converters))
+        values = list(zip(*rows))
+        for column, index in zip(columns, indexes):
+            column.write(position, values[index])
+        position += len(rows)
+
+    for column in columns:
+        column.resize(position)
+    return {x.name: x.buffer for x in columns}
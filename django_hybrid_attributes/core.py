@@ -1,11 +1,33 @@
+import copy
 import functools
+import hashlib
+import operator
 import random
 import string
+import time
 
-from django.db import models
+from django.db import connections, models
+from django.utils import tree
+
+from .signals import hybrid_filter_applied
+from .simplify import simplify
 
 QS_METHOD_FILTER = 'filter'
 QS_METHOD_EXCLUDE = 'exclude'
+WINDOW_LOOKUP_OPERATORS = {'exact': '=', 'lt': '<', 'lte': '<=', 'gt': '>', 'gte': '>='}
+HYBRID_VALUE_PREFIX = '_hybrid_value__'
+
+# Hybrids materialized by `HybridProjection`s: {HybridExpression._signature(): (projection, column name)}
+_projected_columns = {}
+
+
+def _hybrid_value_alias(name, args=(), kwargs=None):
+    """Deterministic alias under which a hybrid value (for the given arguments) is annotated to be read by instances."""
+    alias = f'{HYBRID_VALUE_PREFIX}{name}'
+    if args or kwargs:
+        signature = repr((tuple(args), sorted((kwargs or {}).items())))
+        alias += '__' + hashlib.md5(signature.encode()).hexdigest()[:10]
+    return alias
 
 
 def _make_expression_result(lookup):
@@ -15,41 +37,389 @@ def _make_expression_result(lookup):
         else:
             final_lookup = f'i{lookup}' if hybrid_expression_instance.ignore_case_in_lookup else lookup
 
+        # The expression itself is only built when the comparison is applied to a queryset
         return HybridExpressionResult(
-            expr=hybrid_expression_instance.expression(),
+            expr=None,
             value=value,
             lookup=final_lookup,
             queryset_method=hybrid_expression_instance.queryset_method,
             alias=hybrid_expression_instance.alias,
+            hybrid_expression=hybrid_expression_instance,
         )
     return inner
 
 
-class HybridExpressionResult(object):
-    def __init__(self, expr, value, lookup, queryset_method, alias=None):
-        self.expr = expr
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _ordered(expression, descending):
+    return expression.desc() if descending else expression.asc()
+
+
+def _unwrap_callable(callable_):
+    while isinstance(callable_, functools.partial):
+        callable_ = callable_.func
+    return callable_
+
+
+def _compile_annotation(queryset, alias):
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    return compiler.compile(query.annotations[alias])
+
+
+class HybridLookup(tuple):
+    """`(lookup, value)` child of a hybrid comparison `Q`, which also knows the hybrid expressions to be annotated for it.
+
+    Django sees it as a plain `(lookup, value)` pair, so it survives `Q` combinations (`|`, `&`, `~`) and copies.
+    """
+
+    def __new__(cls, lookup, value, annotations, build_time=0.0):
+        instance = super().__new__(cls, (lookup, value))
+        instance.annotations = annotations  # {alias: (hybrid_expression, expression or None to be built lazily)}
+        instance.build_time = build_time
+        instance._expressions = {}
+        return instance
+
+    def __getnewargs__(self):
+        return (*self, self.annotations, self.build_time)
+
+    def __deepcopy__(self, memodict):
+        return self
+
+    @property
+    def main_alias(self):
+        return next(iter(self.annotations))
+
+    def _expression(self, alias):
+        """Expression annotated under an alias, built (once) on first use."""
+        if alias not in self._expressions:
+            hybrid_expression, expression = self.annotations[alias]
+            if expression is None:
+                started = time.perf_counter()
+                expression = hybrid_expression.expression()
+                if alias == self.main_alias:
+                    self.build_time += time.perf_counter() - started
+            self._expressions[alias] = expression
+        return self._expressions[alias]
+
+    @property
+    def window(self):
+        return getattr(self._expression(self.main_alias), 'contains_over_clause', False)
+
+    def _annotate(self, queryset):
+        """Annotate the hybrid expressions of this lookup to a queryset.
+
+        Expressions already annotated to the queryset (by earlier hybrid lookups) are reused: either the whole annotation
+        (unless an explicit alias was asked for) or identical subtrees, referenced by their alias. Note subtrees are only
+        shared in Python (saving their resolution): Django inlines the referenced annotation, so the SQL is unchanged.
+
+        :return: annotated queryset, mapping of alias to `HybridExpression` and the lookup to filter it by (which
+            references the reused aliases).
+
+        """
+        build_time = self.build_time
+        started = time.perf_counter()
+        hybrid_aliases = {}
+        renamed = {}
+        for alias, (hybrid_expression, _) in self.annotations.items():
+            expression = self._expression(alias)
+            known_expressions = getattr(queryset, '_hybrid_expressions', None)
+            reused_alias = _known_alias(known_expressions, expression)
+            if reused_alias is not None and hybrid_expression is not None and hybrid_expression.alias is None:
+                renamed[alias] = alias = reused_alias
+            else:
+                queryset = queryset.annotate(**{alias: _reuse_subexpressions(expression, known_expressions)})
+                if known_expressions is not None:
+                    _remember_expression(queryset, expression, alias)
+
+            if hybrid_expression is not None:
+                hybrid_aliases[alias] = hybrid_expression
+
+        if hasattr(queryset, '_hybrid_aliases'):
+            queryset._hybrid_aliases.update(hybrid_aliases)
+
+        main_alias = self.main_alias
+        hybrid_expression = self.annotations[main_alias][0]
+        alias = renamed.get(main_alias, main_alias)
+        if hybrid_filter_applied.receivers and hybrid_expression is not None:
+            apply_time = time.perf_counter() - started - (self.build_time - build_time)
+            _send_filter_applied(queryset, hybrid_expression, alias, self.build_time, apply_time)
+
+        return queryset, hybrid_aliases, self._renamed(main_alias, renamed)
+
+    def _renamed(self, main_alias, renamed):
+        if not renamed:
+            return self
+        key, value = self
+        if main_alias in renamed:
+            key = renamed[main_alias] + key[len(main_alias):]
+        if isinstance(value, models.F) and value.name in renamed:
+            value = models.F(renamed[value.name])
+        hybrid_lookup = HybridLookup(key, value, self.annotations, build_time=self.build_time)
+        hybrid_lookup._expressions = self._expressions
+        return hybrid_lookup
+
+
+def _known_alias(known_expressions, expression):
+    if not known_expressions:
+        return None
+    try:
+        return known_expressions.get(expression)
+    except TypeError:  # Unhashable expression (e.g. older Django versions)
+        return None
+
+
+def _remember_expression(queryset, expression, alias):
+    try:
+        queryset._hybrid_expressions[expression] = alias
+    except TypeError:
+        pass
+
+
+# `models.Window` doesn't exist before Django 2.0
+_UNREUSABLE_EXPRESSIONS = tuple(x for x in (models.Aggregate, getattr(models, 'Window', None)) if x is not None)
+
+
+def _is_reusable(expression, root=True):
+    # Leaves (fields, values) aren't worth an alias, while aggregates and windows can't be referenced inside others
+    if not hasattr(expression, 'get_source_expressions') or isinstance(expression, _UNREUSABLE_EXPRESSIONS):
+        return not root and not isinstance(expression, _UNREUSABLE_EXPRESSIONS)
+    source_expressions = expression.get_source_expressions()
+    return bool(source_expressions or not root) and all(_is_reusable(x, root=False) for x in source_expressions)
+
+
+def _reuse_subexpressions(expression, known_expressions):
+    """Replace subtrees of an expression which are already annotated (and aren't aggregates/windows) by their alias.
+
+    This saves building and resolving them again, but not evaluating them: the compiled SQL inlines the annotation.
+    """
+    if not known_expressions or not hasattr(expression, 'get_source_expressions'):
+        return expression
+
+    source_expressions = expression.get_source_expressions()
+    reused = []
+    for source_expression in source_expressions:
+        alias = _known_alias(known_expressions, source_expression) if _is_reusable(source_expression) else None
+        if alias is not None:
+            reused.append(models.F(alias))
+        else:
+            reused.append(_reuse_subexpressions(source_expression, known_expressions))
+
+    if all(x is y for x, y in zip(reused, source_expressions)):
+        return expression
+    expression = expression.copy()
+    expression.set_source_expressions(reused)
+    return expression
+
+
+def _hybrid_lookups(node):
+    for child in node.children:
+        if isinstance(child, HybridLookup):
+            yield child
+        elif isinstance(child, tree.Node):
+            yield from _hybrid_lookups(child)
+
+
+def _contains_hybrid_lookups(arg):
+    return isinstance(arg, tree.Node) and any(True for _ in _hybrid_lookups(arg))
+
+
+def _replace_lookups(node, replacements):
+    # Copying a `HybridExpressionResult` loses its attributes on Django 4.1+ (`Node.__copy__`), so a plain `Q` is used
+    clone = node._as_q() if isinstance(node, HybridExpressionResult) else copy.copy(node)
+    clone.children = [
+        replacements.get(id(x), x) if isinstance(x, HybridLookup)
+        else _replace_lookups(x, replacements) if isinstance(x, tree.Node)
+        else x
+        for x in node.children
+    ]
+    return clone
+
+
+def annotate_hybrid_lookups(queryset, *args):
+    """Annotate the hybrid expressions compared in (possibly combined) `Q` objects, so they can be used to filter.
+
+    Most likely you want to use `HybridQuerySetMixin` methods (`filter()`, `exclude()`, `get()`...) instead.
+
+    :param queryset: queryset to be annotated.
+    :param args: `Q` objects (hybrid comparisons or any combination of them with other `Q` objects).
+    :return: annotated queryset and the `Q` objects to filter it by (referencing annotations reused by the queryset).
+
+    """
+    filter_args = []
+    for arg in args:
+        if not isinstance(arg, tree.Node):
+            filter_args.append(arg)
+            continue
+        replacements = {}
+        for lookup in _hybrid_lookups(arg):
+            if lookup.window:
+                raise ValueError(
+                    'Window function comparisons cannot be negated or combined with other Q objects, '
+                    'filter (or exclude) by them directly'
+                )
+            queryset, _, renamed_lookup = lookup._annotate(queryset)
+            if renamed_lookup is not lookup:
+                replacements[id(lookup)] = renamed_lookup
+        filter_args.append(_replace_lookups(arg, replacements) if replacements else arg)
+    return queryset, filter_args
+
+
+def _send_filter_applied(queryset, hybrid_expression, alias, build_time, apply_time):
+    sql, params = _compile_annotation(queryset, alias)
+    hybrid_filter_applied.send(
+        sender=hybrid_expression.model,
+        hybrid=hybrid_expression.name,
+        alias=alias,
+        queryset=queryset,
+        build_time=build_time,
+        apply_time=apply_time,
+        sql=sql,
+        params=tuple(params),
+    )
+
+
+class HybridExpressionResult(models.Q):
+    """Comparison between a hybrid expression and a value.
+
+    It is a `Q` object, so it may be passed to `filter()`, `exclude()`, `get()` (and friends) of hybrid querysets and
+    combined with other `Q` objects through `|`, `&` and `~`.
+
+    :Example:
+    >>> Klass.objects.filter(models.Q(my_field=1) | (Klass.my_property == 'whatever'))
+    >>> Klass.objects.exclude(Klass.my_property == 'whatever')
+
+    """
+
+    def __init__(self, expr, value, lookup, queryset_method, alias=None, hybrid_expression=None, build_time=0.0):
+        assert expr is not None or hybrid_expression is not None, 'Either an expression or a hybrid expression is needed'
         self.value = value
         self.lookup = lookup
         self.queryset_method = queryset_method
         self.alias = alias or self._generate_alias()
+        self.hybrid_expression = hybrid_expression
+
+        annotations = {self.alias: (hybrid_expression, expr)}
+        if isinstance(value, HybridExpression):
+            alias2 = value.alias or self._generate_alias()
+            annotations[alias2] = (value, None)
+            value = models.F(alias2)
+
+        hybrid_lookup = HybridLookup(f'{self.alias}__{lookup}', value, annotations, build_time=build_time)
+        super().__init__(hybrid_lookup)
+        self.negated = queryset_method == QS_METHOD_EXCLUDE  # `Q(_negated=...)` isn't accepted before Django 2.0
+
+    @property
+    def expr(self):
+        """Expression compared by this result. Built on first use (usually when the comparison is applied to a queryset)."""
+        return self.children[0]._expression(self.alias)
+
+    @property
+    def build_time(self):
+        """Seconds spent building the expression (0 while it isn't built)."""
+        return self.children[0].build_time
 
     def _generate_alias(self):
         return 'hybrid_' + ''.join(random.choice(string.ascii_lowercase) for _ in range(10))
 
+    def _as_q(self):
+        q = models.Q(*self.children)
+        q.negated = self.negated
+        return q
+
+    def _combine(self, other, conn):
+        return self._as_q()._combine(other, conn)
+
+    def __invert__(self):
+        return ~self._as_q()
+
+    def deconstruct(self):
+        # Reconstructed as a plain `Q` (the hybrid expressions to be annotated can't be serialized)
+        return self._as_q().deconstruct()
+
+    def __deepcopy__(self, memodict):
+        instance = super().__deepcopy__(memodict)
+        instance.__dict__.update({k: v for k, v in self.__dict__.items() if k not in instance.__dict__})
+        return instance
+
     def _apply_filter(self, queryset):
-        qs = queryset.annotate(**{self.alias: self.expr})
+        return self._apply_filter_with_aliases(queryset)[0]
+
+    def _apply_filter_with_aliases(self, queryset):
+        """Same as `_apply_filter()`, but also return the mapping of annotated alias to the originating `HybridExpression`."""
+        hybrid_lookup = self.children[0]
+        if hybrid_lookup.window:
+            return self._apply_window_filter(queryset, time.perf_counter())
+
+        qs, hybrid_aliases, hybrid_lookup = hybrid_lookup._annotate(queryset)
+        qs = getattr(qs, self.queryset_method)(**dict([hybrid_lookup]))
+        return qs, hybrid_aliases
+
+    def _apply_exclude(self, queryset):
+        """Apply the negation of this comparison to a queryset, as `queryset.exclude(self)` does."""
+        negated = type(self)(
+            self.expr, self.value, self.lookup,
+            QS_METHOD_FILTER if self.queryset_method == QS_METHOD_EXCLUDE else QS_METHOD_EXCLUDE,
+            alias=self.alias, hybrid_expression=self.hybrid_expression, build_time=self.build_time,
+        )
+        return negated._apply_filter(queryset)
+
+    def _apply_window_filter(self, queryset, started):
+        # Window functions are evaluated after WHERE, so they can't be filtered directly: the window is computed in a
+        # subquery (over the rows currently filtered) and only the matching primary keys are kept in the outer query.
+        if self.lookup not in WINDOW_LOOKUP_OPERATORS:
+            raise ValueError(
+                f'Lookup "{self.lookup}" is not supported for window functions, use one of: {", ".join(WINDOW_LOOKUP_OPERATORS)}'
+            )
+        if isinstance(self.value, (HybridExpression, list, tuple, set, dict)) or hasattr(self.value, 'resolve_expression'):
+            raise TypeError(f'Window functions can only be compared against plain values, not {self.value!r}')
+
+        pk_alias = f'{self.alias}_pk'
+        inner = queryset.order_by().annotate(**{pk_alias: models.F('pk'), self.alias: self.expr}).values(pk_alias, self.alias)
+        connection = connections[queryset.db]
+        inner_sql, inner_params = inner.query.get_compiler(using=queryset.db).as_sql()
+        qn = connection.ops.quote_name
+        sql = (
+            f'SELECT {qn(pk_alias)} FROM ({inner_sql}) {qn(self.alias + "_window")} '
+            f'WHERE {qn(self.alias)} {WINDOW_LOOKUP_OPERATORS[self.lookup]} %s'
+        )
+        # `pk__in=RawSQL(...)` renders as `IN ((SELECT ...))` up to Django 2.2, which matches the first row only
+        pk_column = f'{qn(queryset.model._meta.db_table)}.{qn(queryset.model._meta.pk.column)}'
+        in_operator = 'NOT IN' if self.queryset_method == QS_METHOD_EXCLUDE else 'IN'
+        qs = queryset.extra(where=[f'{pk_column} {in_operator} ({sql})'], params=(*inner_params, self.value))
 
-        value = self.value
-        if isinstance(value, HybridExpression):
-            alias2 = value.alias or self._generate_alias()
-            qs = qs.annotate(**{alias2: value.expression()})
-            value = models.F(f'{alias2}')
+        if hybrid_filter_applied.receivers and self.hybrid_expression is not None:
+            _send_filter_applied(inner, self.hybrid_expression, self.alias, self.build_time, time.perf_counter() - started)
+
+        return qs, {}
+
+    def explain(self, queryset, format=None, **options):
+        """Apply this comparison to a queryset and explain it, mapping the query plan back to the hybrids involved.
+
+        Useful to find out whether a hybrid would use an index or force a full scan before shipping it.
+
+        :param queryset: queryset to apply this comparison to.
+        :param format: [optional] format passed to `QuerySet.explain()`.
+        :param options: [optional] backend-specific options passed to `QuerySet.explain()`.
+        :rtype: django_hybrid_attributes.explain.HybridExplanation
+
+        :Example:
+        >>> explanation = (Klass.my_property == 'whatever').explain(Klass.objects.all())
+        >>> explanation.full_scans
+        [<HybridPlanNode 'SCAN app_klass' hybrids=['Klass.my_property'] flags=['full_scan']>]
+
+        """
+        from .explain import explain_hybrids
 
-        return getattr(qs, self.queryset_method)(**{f'{self.alias}__{self.lookup}': value})
+        qs, hybrid_aliases = self._apply_filter_with_aliases(queryset)
+        hybrid_aliases = {**getattr(qs, '_hybrid_aliases', {}), **hybrid_aliases}
+        return explain_hybrids(qs, hybrid_aliases, format=format, **options)
 
 
 class HybridExpression(object):
-    def __init__(self, callable_, callable_args=(), callable_kwargs={}, ignore_case_in_lookup=False, queryset_method=QS_METHOD_FILTER, force_lookup='', alias=None):  # noqa
+    def __init__(self, callable_, callable_args=(), callable_kwargs={}, ignore_case_in_lookup=False, queryset_method=QS_METHOD_FILTER, force_lookup='', alias=None, window=None, use_projection=True):  # noqa
         self.callable = callable_
         self.callable_args = callable_args
         self.callable_kwargs = callable_kwargs
@@ -57,6 +427,8 @@ class HybridExpression(object):
         self.queryset_method = queryset_method
         self.force_lookup = force_lookup
         self.alias = alias
+        self.window = window
+        self.use_projection = use_projection
 
     __lt__ = _make_expression_result('lt')
     __le__ = _make_expression_result('lte')
@@ -85,9 +457,29 @@ class HybridExpression(object):
             queryset_method=overrides.get('queryset_method', self.queryset_method),
             force_lookup=overrides.get('force_lookup', self.force_lookup),
             alias=overrides.get('alias', self.alias),
+            window=overrides.get('window', self.window),
+            use_projection=overrides.get('use_projection', self.use_projection),
         )
         return instance
 
+    @property
+    def name(self):
+        """Name of the hybrid attribute which originated this expression."""
+        return _unwrap_callable(self.callable).__name__
+
+    @property
+    def model(self):
+        """Model class which declares the hybrid attribute that originated this expression."""
+        return _unwrap_callable(self.callable).__self__
+
+    @property
+    def through_path(self):
+        """Relation path set by `.through()` (with trailing `__`), or an empty string."""
+        return getattr(self.callable, 'keywords', {}).get('through', '')
+
+    def _signature(self):
+        return (self.model._meta.label_lower, self.name, repr(self.callable_args), repr(sorted(self.callable_kwargs.items())))
+
     def alias(self, alias):
         """Force a particular alias to be used when annotating this expression to queryset.
 
@@ -113,9 +505,26 @@ class HybridExpression(object):
         >>> Klass.objects.annotate(_prop=Klass.my_property.e())
 
         """
-        return self.callable(*self.callable_args, **self.callable_kwargs)
+        projected = _projected_columns.get(self._signature()) if self.use_projection and _projected_columns else None
+        if projected is not None and projected[0].table_exists():
+            projection, column = projected
+            expression = models.F(f'{self.through_path}{projection._column_path(column)}')
+        else:
+            expression = simplify(self.callable(*self.callable_args, **self.callable_kwargs))
+        if self.window is not None:
+            expression = self.window(expression)
+        return expression
     e = expression
 
+    def live(self):
+        """Compute this expression from its hybrid definition, even if it is materialized by a `HybridProjection`.
+
+        :Example:
+        >>> Klass.objects.filter(Klass.my_property.live() == 'whatever')  # Skips the projection join
+
+        """
+        return self._clone(use_projection=False)
+
     def ignore_case(self):
         """Mark the expression to use ignore_case version of lookup.
 
@@ -156,3 +565,122 @@ class HybridExpression(object):
         assert not through.endswith('__'), 'No need to add explictly `__` to the end of through relation'
         return self._clone(callable_=functools.partial(self.callable, through=f'{through}__'))
     t = through
+
+    def _window_clone(self, window):
+        assert self.window is None, 'Window functions cannot be nested'
+        if not hasattr(models, 'Window'):
+            raise NotImplementedError('Window functions require Django 2.0 or later')
+        return self._clone(window=window)
+
+    def rank(self, partition_by=None, descending=False):
+        """Turn this expression into the rank (with gaps on ties) of each row, ordered by the hybrid value.
+
+        Comparisons against ranks are evaluated in a subquery, so one can filter on them (top-N per group, for instance).
+        Note the window is computed over the rows filtered *before* the rank comparison is applied.
+
+        :param partition_by: [optional] field name(s)/expression(s) to partition rows by (rank is restarted per partition).
+        :param descending: [optional] whether higher values are ranked first. Defaults to False.
+
+        :Example:
+        >>> Klass.objects.annotate(position=Klass.my_property.rank(partition_by='group', descending=True).e())
+        >>> Klass.objects.filter(Klass.my_property.rank(partition_by='group', descending=True) <= 3)  # Top 3 per group
+
+        """
+        def window(expression):
+            return models.Window(
+                models.functions.Rank(), partition_by=partition_by, order_by=_ordered(expression, descending)
+            )
+        return self._window_clone(window)
+
+    def row_number(self, partition_by=None, descending=False):
+        """Turn this expression into the sequential number (no ties) of each row, ordered by the hybrid value.
+
+        Same usage of `.rank()`.
+
+        """
+        def window(expression):
+            return models.Window(
+                models.functions.RowNumber(), partition_by=partition_by, order_by=_ordered(expression, descending)
+            )
+        return self._window_clone(window)
+
+    def running_sum(self, partition_by=None, order_by='pk'):
+        """Turn this expression into the cumulative sum of the hybrid value, row by row.
+
+        Same usage of `.rank()`.
+
+        :param partition_by: [optional] field name(s)/expression(s) to partition rows by (sum is restarted per partition).
+        :param order_by: [optional] field name(s)/expression(s) defining rows order (prefix with `-` for descending order).
+
+        """
+        order_by = [_ordered(models.F(x.lstrip('-')), x.startswith('-')) if isinstance(x, str) else x for x in _as_list(order_by)]
+
+        def window(expression):
+            return models.Window(
+                models.Sum(expression), partition_by=partition_by, order_by=order_by, frame=models.RowRange(end=0),
+            )
+        return self._window_clone(window)
+
+
+def _make_variants_comparison(operator_name):
+    def inner(variants, value):
+        comparisons = [getattr(x, operator_name)(value) for x in variants]
+        return functools.reduce(operator.or_, comparisons[1:], comparisons[0]._as_q())
+    return inner
+
+
+class HybridExpressionVariants(object):
+    """Class-level hybrid method evaluated over many argument values, as returned by `Klass.my_method.many()`.
+
+    Every variant is annotated under a deterministic alias (the same one `.with_hybrids()` uses), so all of them are
+    computed by a single query. Comparisons match rows where *any* of the variants matches, in a single WHERE.
+
+    :Example:
+    >>> variants = Klass.my_method.many([1, 2, 3])
+    >>> variants.values()  # {pk: {1: value, 2: value, 3: value}, ...}
+    >>> Klass.objects.filter(variants == 'whatever')  # my_method(1) == 'whatever' OR my_method(2) == 'whatever' OR ...
+    >>> Klass.objects.with_hybrids(variants)  # `obj.my_method(n)` reads the precomputed values
+
+    """
+
+    def __init__(self, hybrid_expressions):
+        assert hybrid_expressions, 'At least one argument value must be given'
+        self.hybrid_expressions = hybrid_expressions  # {argument value: HybridExpression}
+
+    __lt__ = _make_variants_comparison('__lt__')
+    __le__ = _make_variants_comparison('__le__')
+    __gt__ = _make_variants_comparison('__gt__')
+    __ge__ = _make_variants_comparison('__ge__')
+    __eq__ = _make_variants_comparison('__eq__')
+    __ne__ = _make_variants_comparison('__ne__')
+    is_ = __eq__
+
+    def __iter__(self):
+        return iter(self.hybrid_expressions.values())
+
+    def __len__(self):
+        return len(self.hybrid_expressions)
+
+    @property
+    def aliases(self):
+        """Mapping of argument value to the alias its variant is annotated under."""
+        return {key: x.alias for key, x in self.hybrid_expressions.items()}
+
+    def lookup(self, lookup):
+        """Force a particular lookup to be used in the comparisons of every variant (see `HybridExpression.lookup()`)."""
+        return self.__class__({key: x.lookup(lookup) for key, x in self.hybrid_expressions.items()})
+    l = lookup  # noqa
+
+    def values(self, queryset=None):
+        """Compute every variant for the rows of a queryset, in a single query.
+
+        :param queryset: [optional] queryset whose rows are evaluated. Defaults to all objects of the hybrid model.
+        :return: mapping of primary key to a mapping of argument value to the hybrid value.
+        :rtype: dict
+
+        """
+        if queryset is None:
+            queryset = next(iter(self)).model._default_manager.all()
+        aliases = self.aliases
+        queryset = queryset.annotate(**{x.alias: x.expression() for x in self}).values_list('pk', *aliases.values())
+        return {row[0]: dict(zip(aliases, row[1:])) for row in queryset}
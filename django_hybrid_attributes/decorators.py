@@ -1,6 +1,86 @@
+import contextlib
 import functools
+import time
 
-from .core import HybridExpression
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models
+
+from .core import HybridExpression, HybridExpressionVariants, _hybrid_value_alias
+from .signals import hybrid_attribute_accessed
+
+HYBRID_VALUES_ATTR = '_hybrid_values'
+HYBRID_VALUES_STATE_ATTR = '_hybrid_values_state'
+PREFETCHED_OBJECTS_CACHE_ATTR = '_prefetched_objects_cache'
+_MISSING = object()
+
+
+def _loaded_fields(instance):
+    return {x.attname: instance.__dict__[x.attname] for x in instance._meta.concrete_fields if x.attname in instance.__dict__}
+
+
+def _set_hybrid_values(instance, hybrid_values):
+    """Store hybrid values computed in SQL, so the instance reads them while its fields keep the values they were computed from.
+
+    The prefetched objects cache is created beforehand (`prefetch_related()` keeps an existing one), so that a full
+    `refresh_from_db()` (which replaces it, on recent Django versions) discards the values as well.
+    """
+    prefetched_objects_cache = instance.__dict__.setdefault(PREFETCHED_OBJECTS_CACHE_ATTR, {})
+    instance.__dict__[HYBRID_VALUES_ATTR] = hybrid_values
+    instance.__dict__[HYBRID_VALUES_STATE_ATTR] = (_loaded_fields(instance), prefetched_objects_cache)
+
+
+def _clear_hybrid_values(instance):
+    instance.__dict__.pop(HYBRID_VALUES_ATTR, None)
+    instance.__dict__.pop(HYBRID_VALUES_STATE_ATTR, None)
+
+
+def _get_hybrid_values(instance):
+    hybrid_values = instance.__dict__.get(HYBRID_VALUES_ATTR)
+    if not hybrid_values:
+        return None
+
+    fields, prefetched_objects_cache = instance.__dict__[HYBRID_VALUES_STATE_ATTR]
+    is_stale = (
+        instance.__dict__.get(PREFETCHED_OBJECTS_CACHE_ATTR) is not prefetched_objects_cache or
+        any(instance.__dict__.get(name, _MISSING) != value for name, value in fields.items())
+    )
+    if is_stale:
+        _clear_hybrid_values(instance)
+        return None
+    return hybrid_values
+
+
+def _precomputed(func, hybrid_values):
+    @functools.wraps(func)
+    def inner(instance, *args, **kwargs):
+        alias = _hybrid_value_alias(func.__name__, args, kwargs)
+        if alias in hybrid_values:
+            return hybrid_values[alias]
+        return func(instance, *args, **kwargs)
+    return inner
+
+
+def _instrumented(func, owner):
+    @functools.wraps(func)
+    def inner(instance, *args, **kwargs):
+        queries = []
+
+        def count_queries(execute, *execute_args):
+            queries.append(None)
+            return execute(*execute_args)
+
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_queries))
+            started = time.perf_counter()
+            result = func(instance, *args, **kwargs)
+            duration = time.perf_counter() - started
+
+        hybrid_attribute_accessed.send(
+            sender=owner, hybrid=func.__name__, instance=instance, duration=duration, queries=len(queries),
+        )
+        return result
+    return inner
 
 
 class hybrid_method(object):
@@ -33,13 +113,27 @@ class hybrid_method(object):
     def __get__(self, instance, owner):
         if instance is None:
             return self._hybrid_expression_wrapper(self.expr.__get__(owner, owner.__class__))
-        else:
-            return self.func.__get__(instance, owner)
+
+        func = self.func
+        hybrid_values = _get_hybrid_values(instance)
+        if hybrid_values:
+            func = _precomputed(func, hybrid_values)
+        if hybrid_attribute_accessed.receivers:
+            func = _instrumented(func, owner)
+        return func.__get__(instance, owner)
 
     def _hybrid_expression_wrapper(self, expr):
         @functools.wraps(expr)
         def inner(*args, **kwargs):
             return HybridExpression(expr, callable_args=args, callable_kwargs=kwargs)
+
+        def many(values, **kwargs):
+            """Evaluate this hybrid method for many values of its first argument (other arguments given as kwargs)."""
+            return HybridExpressionVariants({
+                x: inner(x, **kwargs).a(_hybrid_value_alias(expr.__name__, (x,), kwargs)) for x in values
+            })
+
+        inner.many = many
         return inner
 
     def expression(self, expr):
@@ -88,11 +182,13 @@ class hybrid_property(hybrid_method):
     def __set__(self, instance, value):
         if self.func_setter is None:
             raise AttributeError("can't set attribute")
+        _clear_hybrid_values(instance)
         self.func_setter(instance, value)
 
     def __delete__(self, instance):
         if self.func_deleter is None:
             raise AttributeError("can't delete attribute")
+        _clear_hybrid_values(instance)
         self.func_deleter(instance)
 
     def setter(self, func_setter):
@@ -102,3 +198,111 @@ class hybrid_property(hybrid_method):
     def deleter(self, func_deleter):
         self.func_deleter = func_deleter
         return self
+
+
+_PYTHON_AGGREGATES = {
+    models.Avg: lambda values: sum(values) / len(values) if values else None,
+    models.Count: len,
+    models.Max: lambda values: max(values) if values else None,
+    models.Min: lambda values: min(values) if values else None,
+    models.Sum: lambda values: sum(values) if values else None,
+}
+
+
+def _same_query(queryset1, queryset2):
+    try:
+        return str(queryset1.order_by().query) == str(queryset2.order_by().query)
+    except EmptyResultSet:
+        return False
+
+
+class hybrid_aggregate(hybrid_property):
+    """Hybrid property defined as an aggregate over a to-many relation (reverse foreign key or many-to-many).
+
+    Class-level behavior is a correlated subquery (`Subquery(OuterRef)`), so no JOIN + GROUP BY is added to the outer
+    query. Instance-level behavior is computed in Python from prefetched objects when the relation was prefetched (with
+    `prefetch_related()`), or by a single aggregate query otherwise.
+
+    :param relation: name of the to-many relation (as used in queryset lookups).
+    :type relation: str
+    :param aggregate: aggregate to compute over the related objects (`Avg('grade')`, `Count('id')`, etc).
+
+    :Example:
+
+    >>> from django.db import models
+    >>> from django_hybrid_attributes import HybridQuerySet, hybrid_aggregate
+    >>> class Student(models.Model):
+    ...     objects = HybridQuerySet.as_manager()
+    ...     average_grade = hybrid_aggregate('studentclassroom', models.Avg('grade'))
+    ...     failures = hybrid_aggregate('studentclassroom', models.Count('id', filter=models.Q(grade__lt=7)))
+    >>> Student.objects.filter(Student.average_grade >= 7)
+
+    """
+
+    def __init__(self, relation, aggregate):
+        self.relation = relation
+        self.aggregate = aggregate
+        super().__init__(self._make_function())
+        self.expr = self._make_expression()
+
+    def __set_name__(self, owner, name):
+        self.func.__name__ = self.expr.__name__ = name
+
+    def contribute_to_class(self, cls, name):
+        # Django (up to 2.1) sets model attributes through `add_to_class()`, so `__set_name__()` isn't called for them
+        self.__set_name__(cls, name)
+        setattr(cls, name, self)
+
+    def _get_relation(self, model):
+        field = model._meta.get_field(self.relation)
+        assert field.one_to_many or field.many_to_many, f'`{self.relation}` is not a to-many relation of {model.__name__}'
+        return field
+
+    def _get_remote_lookup(self, field):
+        return field.field.name if field.auto_created else field.related_query_name()
+
+    def _make_expression(self):
+        def expression(cls, through=''):
+            field = self._get_relation(cls)
+            remote_lookup = self._get_remote_lookup(field)
+            queryset = (
+                field.related_model._default_manager
+                .filter(**{remote_lookup: models.OuterRef(f'{through}pk')})
+                .order_by()
+                .values(remote_lookup)
+                .annotate(_hybrid_aggregate=self.aggregate)
+                .values('_hybrid_aggregate')
+            )
+            result = models.Subquery(queryset)
+            if isinstance(self.aggregate, models.Count):
+                result = models.functions.Coalesce(result, 0)
+            return result
+        return expression
+
+    def _make_function(self):
+        def function(instance):
+            field = self._get_relation(instance.__class__)
+            manager = getattr(instance, field.get_accessor_name() if field.auto_created else field.name)
+            # `manager.all()` returns the prefetched objects, which may be filtered (by `Prefetch(queryset=...)`)
+            prefetched = manager.all()
+            queryset = manager._apply_rel_filters(manager.model._default_manager.all())
+            if prefetched._result_cache is not None and self._can_compute_in_python() and _same_query(prefetched, queryset):
+                return self._compute_in_python(prefetched._result_cache)
+            return queryset.aggregate(_hybrid_aggregate=self.aggregate)['_hybrid_aggregate']
+        return function
+
+    def _can_compute_in_python(self):
+        if type(self.aggregate) not in _PYTHON_AGGREGATES or getattr(self.aggregate, 'filter', None) is not None:
+            return False
+        source, = self.aggregate.get_source_expressions()
+        return isinstance(source, models.expressions.Star) or (isinstance(source, models.F) and '__' not in source.name)
+
+    def _compute_in_python(self, objs):
+        source, = self.aggregate.get_source_expressions()
+        if isinstance(source, models.expressions.Star):
+            values = list(objs)
+        else:
+            values = [x for x in (getattr(obj, source.name) for obj in objs) if x is not None]
+        if getattr(self.aggregate, 'distinct', False):  # Not an attribute of aggregates before Django 2.2
+            values = list(set(values))
+        return _PYTHON_AGGREGATES[type(self.aggregate)](values)
@@ -0,0 +1,146 @@
+import re
+
+from .core import _compile_annotation
+
+FLAG_FULL_SCAN = 'full_scan'
+FLAG_DISTINCT_SORT = 'distinct_sort'
+FLAG_REPEATED_SUBPLAN = 'repeated_subplan'
+
+_SQL_QUALIFIER_RE = re.compile(r'[`"]?(\w+)[`"]?\.[`"]?\w+')
+_SQL_TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+[`"]?(\w+)[`"]?(?:\s+(?!ON\b|WHERE\b|INNER\b|LEFT\b)(\w+))?', re.IGNORECASE)
+_PLAN_WORD_RE = re.compile(r'\w+')
+
+_FULL_SCAN_RE = re.compile(r'^(?:SCAN(?!.*\bUSING\b)|.*\bSeq Scan\b)', re.IGNORECASE)
+_DISTINCT_SORT_RE = re.compile(r'\bFOR DISTINCT\b|^(?:->\s*)?Unique\b')
+_SORT_RE = re.compile(r'^(?:->\s*)?Sort\b|\bTEMP B-TREE\b')
+_REPEATED_SUBPLAN_RE = re.compile(r'\bCORRELATED\b|\bSubPlan\b')
+
+
+def _hybrid_label(hybrid_expression):
+    return f'{hybrid_expression.model.__name__}.{hybrid_expression.name}'
+
+
+def _sql_relations(sql):
+    """Get the (lowercased) table names and table aliases referenced by a SQL fragment."""
+    relations = set(_SQL_QUALIFIER_RE.findall(sql))
+    for table, table_alias in _SQL_TABLE_RE.findall(sql):
+        relations.add(table)
+        if table_alias:
+            relations.add(table_alias)
+    return {x.lower() for x in relations}
+
+
+def _plan_detail(line):
+    """Strip SQLite's "id parent notused" prefix and PostgreSQL's indentation from a plan line."""
+    line = line.strip()
+    match = re.match(r'^\d+ \d+ \d+ (.*)$', line)
+    if match:
+        line = match.group(1)
+    return line
+
+
+class HybridPlanNode(object):
+    def __init__(self, line, hybrids, flags):
+        self.line = line
+        self.detail = _plan_detail(line)
+        self.hybrids = hybrids
+        self.flags = flags
+
+    def __repr__(self):
+        return f'<HybridPlanNode {self.detail!r} hybrids={list(self.hybrids)} flags={sorted(self.flags)}>'
+
+
+class HybridExplanation(object):
+    """Result of `QuerySet.explain()` with each plan node mapped back to the hybrids which produced it.
+
+    A plan node is attributed to a hybrid when it touches a table (or a subquery table alias) which the SQL fragment
+    generated by that hybrid adds to the query: tables of its joins and subqueries. Nodes over the base model table alone
+    aren't attributed, as every hybrid reading the model columns references it.
+
+    """
+
+    def __init__(self, plan, nodes, hybrid_sql):
+        self.plan = plan
+        self.nodes = nodes
+        self.hybrid_sql = hybrid_sql
+
+    def _nodes_flagged(self, flag):
+        return [x for x in self.nodes if flag in x.flags]
+
+    @property
+    def full_scans(self):
+        return self._nodes_flagged(FLAG_FULL_SCAN)
+
+    @property
+    def distinct_sorts(self):
+        return self._nodes_flagged(FLAG_DISTINCT_SORT)
+
+    @property
+    def repeated_subplans(self):
+        return self._nodes_flagged(FLAG_REPEATED_SUBPLAN)
+
+    @property
+    def hybrids(self):
+        """Mapping of hybrid label (`Klass.attr`) to the plan nodes attributed to it."""
+        result = {x: [] for x in self.hybrid_sql}
+        for node in self.nodes:
+            for hybrid in node.hybrids:
+                result[hybrid].append(node)
+        return result
+
+    def __str__(self):
+        lines = []
+        for node in self.nodes:
+            suffix = []
+            if node.hybrids:
+                suffix.append(', '.join(node.hybrids))
+            if node.flags:
+                suffix.append(', '.join(x.upper() for x in sorted(node.flags)))
+            lines.append(f'{node.line}  [{"; ".join(suffix)}]' if suffix else node.line)
+        return '\n'.join(lines)
+
+
+def explain_hybrids(queryset, hybrid_aliases, format=None, **options):
+    """Run `queryset.explain()` and map the resulting plan nodes back to the hybrids annotated in the queryset.
+
+    Most likely you want to use `HybridQuerySetMixin.explain_hybrids()` or `HybridExpressionResult.explain()` instead.
+
+    :param queryset: queryset to be explained.
+    :param hybrid_aliases: mapping of annotation alias to the `HybridExpression` which originated it.
+    :param format: [optional] format passed to `QuerySet.explain()`. Only text formats can be mapped.
+    :param options: [optional] backend-specific options passed to `QuerySet.explain()` (`analyze=True`, for instance).
+
+    :rtype: HybridExplanation
+
+    """
+    base_relations = {queryset.model._meta.db_table.lower()}
+    hybrid_sql = {}
+    hybrid_relations = {}
+    for alias, hybrid_expression in hybrid_aliases.items():
+        if alias not in queryset.query.annotations:
+            continue
+        label = _hybrid_label(hybrid_expression)
+        sql, params = _compile_annotation(queryset, alias)
+        hybrid_sql[label] = sql
+        hybrid_relations[label] = _sql_relations(sql) - base_relations
+
+    plan = queryset.explain(format=format, **options)
+    nodes = []
+    for line in plan.splitlines():
+        if not line.strip():
+            continue
+        detail = _plan_detail(line)
+        words = {x.lower() for x in _PLAN_WORD_RE.findall(detail)}
+
+        flags = set()
+        if _FULL_SCAN_RE.search(detail):
+            flags.add(FLAG_FULL_SCAN)
+        if _DISTINCT_SORT_RE.search(detail) or (queryset.query.distinct and _SORT_RE.search(detail)):
+            flags.add(FLAG_DISTINCT_SORT)
+        if _REPEATED_SUBPLAN_RE.search(detail):
+            flags.add(FLAG_REPEATED_SUBPLAN)
+
+        hybrids = tuple(label for label, relations in hybrid_relations.items() if relations & words)
+        nodes.append(HybridPlanNode(line, hybrids, flags))
+
+    return HybridExplanation(plan, nodes, hybrid_sql)
@@ -0,0 +1,118 @@
+import threading
+
+from .signals import hybrid_attribute_accessed, hybrid_filter_applied
+
+
+class HybridStats(object):
+    """Aggregated metrics of a single hybrid attribute, as gathered by `InMemoryCollector`."""
+
+    def __init__(self, model, hybrid):
+        self.model = model
+        self.hybrid = hybrid
+        self.filter_count = 0
+        self.build_time = 0.0
+        self.apply_time = 0.0
+        self.access_count = 0
+        self.access_time = 0.0
+        self.access_queries = 0
+        self.sql = None
+
+    @property
+    def label(self):
+        return f'{self.model._meta.label}.{self.hybrid}'
+
+    @property
+    def total_time(self):
+        return self.build_time + self.apply_time + self.access_time
+
+    @property
+    def calls(self):
+        return self.filter_count + self.access_count
+
+    def __repr__(self):
+        return f'<HybridStats {self.label}: calls={self.calls} total_time={self.total_time:.6f}s>'
+
+
+class InMemoryCollector(object):
+    """Collect hybrid metrics emitted through `hybrid_filter_applied` and `hybrid_attribute_accessed` signals.
+
+    Any other signal receiver can be used as a collector (to push metrics to statsd, for instance); this one keeps them
+    in memory so the hottest hybrids can be inspected later on.
+
+    :Example:
+    >>> with InMemoryCollector() as collector:
+    ...     list(Klass.objects.filter(Klass.my_property == 'whatever'))
+    >>> collector.top(5)
+    [<HybridStats app.Klass.my_property: calls=1 total_time=0.000031s>]
+    >>> print(collector.dump(5))
+
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def install(self):
+        hybrid_filter_applied.connect(self.on_filter_applied, weak=False)
+        hybrid_attribute_accessed.connect(self.on_attribute_accessed, weak=False)
+        return self
+
+    def uninstall(self):
+        hybrid_filter_applied.disconnect(self.on_filter_applied)
+        hybrid_attribute_accessed.disconnect(self.on_attribute_accessed)
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def _get_stats(self, model, hybrid):
+        key = (model, hybrid)
+        if key not in self.stats:
+            self.stats[key] = HybridStats(model, hybrid)
+        return self.stats[key]
+
+    def on_filter_applied(self, sender, hybrid, build_time, apply_time, sql, **kwargs):
+        with self._lock:
+            stats = self._get_stats(sender, hybrid)
+            stats.filter_count += 1
+            stats.build_time += build_time
+            stats.apply_time += apply_time
+            stats.sql = sql
+
+    def on_attribute_accessed(self, sender, hybrid, duration, queries, **kwargs):
+        with self._lock:
+            stats = self._get_stats(sender, hybrid)
+            stats.access_count += 1
+            stats.access_time += duration
+            stats.access_queries += queries
+
+    def top(self, n=10, key='total_time'):
+        """Get the `n` hottest hybrids.
+
+        :param n: number of hybrids to return.
+        :type n: int
+        :param key: `HybridStats` attribute used to sort the hybrids (`total_time`, `calls`, `access_queries`, ...).
+        :type key: str
+
+        """
+        with self._lock:
+            stats = list(self.stats.values())
+        return sorted(stats, key=lambda x: getattr(x, key), reverse=True)[:n]
+
+    def dump(self, n=10, key='total_time'):
+        """Get a human-readable report of the `n` hottest hybrids."""
+        lines = []
+        for stats in self.top(n, key=key):
+            lines.append(
+                f'{stats.label}: calls={stats.calls} (filters={stats.filter_count}, accesses={stats.access_count}) '
+                f'total_time={stats.total_time:.6f}s queries={stats.access_queries}'
+            )
+            if stats.sql:
+                lines.append(f'    SQL: {stats.sql}')
+        return '\n'.join(lines)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_hybrid_attributes.projections import get_projections
+
+
+class Command(BaseCommand):
+    help = 'Refresh the tables of hybrid projections (all of them, unless names are given).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Names of the projections to be refreshed.')
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only write differences (deleted, new and changed rows) instead of rebuilding the tables.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to refresh. Defaults to "default".')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows compared at a time on incremental refreshes.')
+
+    def handle(self, *args, **options):
+        projections = get_projections()
+        names = options['names'] or sorted(projections)
+        unknown = [x for x in names if x not in projections]
+        if unknown:
+            raise CommandError(f'Unknown hybrid projection(s): {", ".join(unknown)}')
+
+        for name in names:
+            written = projections[name].refresh(
+                incremental=options['incremental'], using=options['database'], chunk_size=options['chunk_size'],
+            )
+            self.stdout.write(f'{name}: {written} row(s) written')
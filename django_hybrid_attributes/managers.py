@@ -1,39 +1,332 @@
+import functools
+import itertools
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.db import models
 
-from .core import HybridExpressionResult
+from .cache import get_cached_results
+from .columns import export_columns
+from .core import (
+    HYBRID_VALUE_PREFIX, HybridExpression, HybridExpressionResult, HybridExpressionVariants, _contains_hybrid_lookups,
+    _hybrid_value_alias, annotate_hybrid_lookups
+)
+from .explain import explain_hybrids
+from .prefetch import HybridModelIterable, annotate_hybrid_values
+
+try:
+    from asgiref.sync import sync_to_async
+except ImportError:  # Django < 3.0
+    def sync_to_async(*args, **kwargs):
+        raise ImportError('Async support requires asgiref, which is installed along with Django 3.0+')
+
+ASYNC_CHUNK_SIZE = 100
+
+
+async def _aiter_chunks(queryset, chunk_size):
+    """Stream the results of a queryset in lists of `chunk_size` objects, fetched (thread-sensitively) in a worker thread."""
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    fetch_chunk = sync_to_async(lambda: list(itertools.islice(iterator, chunk_size)), thread_sensitive=True)
+    chunk = await fetch_chunk()
+    while chunk:
+        yield chunk
+        chunk = await fetch_chunk()
+
+
+def _split_defaults(args, defaults):
+    # `defaults` may be passed positionally to `get_or_create()`/`update_or_create()`, as in Django.
+    if args and not isinstance(args[0], models.Q):
+        defaults, args = args[0], args[1:]
+    return args, defaults
 
 
 class HybridQuerySetMixin(object):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hybrid_aliases = {}
+        self._hybrid_expressions = {}
+        self._hybrid_cache = None
+
+    def _clone(self, *args, **kwargs):
+        clone = super()._clone(*args, **kwargs)
+        clone._hybrid_aliases = dict(self._hybrid_aliases)
+        clone._hybrid_expressions = dict(self._hybrid_expressions)
+        clone._hybrid_cache = self._hybrid_cache
+        return clone
+
+    def _fetch_all(self):
+        if self._hybrid_cache is not None and self._result_cache is None:
+            self._result_cache = get_cached_results(self, *self._hybrid_cache)
+        super()._fetch_all()
+
+    def cached(self, timeout=DEFAULT_TIMEOUT, cache_alias='default'):
+        """Cache the results of this queryset in a Django cache backend.
+
+        Results are keyed by the normalized signature of the queryset (hybrid identities, arguments, lookups and
+        `through` paths, plus the remaining filters) and are invalidated whenever an instance of any model the queryset
+        depends on (including models queried by hybrid expressions) is saved or deleted, or a many-to-many relation it
+        depends on is changed, by any process (versions are removed from every cache of `settings.CACHES`). Note
+        `QuerySet.update()`, `bulk_create()` and raw SQL do not send these signals, so they don't invalidate it.
+
+        :param timeout: [optional] cache timeout, in seconds. Defaults to the cache backend default timeout.
+        :param cache_alias: [optional] alias of the cache (from `settings.CACHES`) to be used. Defaults to 'default'.
+
+        :Example:
+        >>> Klass.objects.filter(Klass.my_property == True).cached(timeout=60)
+
+        """
+        clone = self._clone()
+        clone._hybrid_cache = (cache_alias, timeout)
+        return clone
 
     def filter(self, *args, **kwargs):
-        hybrid_expression_results = []
+        hybrid_args = []
         common_filter_args = []
 
         for arg in args:
-            if isinstance(arg, HybridExpressionResult):
-                hybrid_expression_results.append(arg)
+            if _contains_hybrid_lookups(arg):
+                hybrid_args.append(arg)
             else:
                 common_filter_args.append(arg)
 
         self = super().filter(*common_filter_args, **kwargs)
 
-        for hybrid_expression_result in hybrid_expression_results:
-            self = hybrid_expression_result._apply_filter(queryset=self)
+        for arg in hybrid_args:
+            if isinstance(arg, HybridExpressionResult):
+                self = arg._apply_filter(queryset=self)
+            else:
+                self, (arg,) = annotate_hybrid_lookups(self, arg)
+                self = super(HybridQuerySetMixin, self).filter(arg)
 
         return self
 
+    def exclude(self, *args, **kwargs):
+        if len(args) == 1 and not kwargs and isinstance(args[0], HybridExpressionResult) and args[0].children[0].window:
+            return args[0]._apply_exclude(queryset=self)  # Window comparisons can't be negated inside the WHERE clause
+        clone, args = annotate_hybrid_lookups(self, *args)
+        return super(HybridQuerySetMixin, clone).exclude(*args, **kwargs)
+
+    def annotate(self, *args, **kwargs):
+        """Same as `QuerySet.annotate()`, but also accepting hybrid expressions and hybrid comparisons (as booleans).
+
+        Positional hybrid expressions are annotated under their alias (given via `.a()`), otherwise they are computed for
+        instances to read them (as `with_hybrids()` does) - so they don't shadow the hybrid attributes themselves.
+
+        :Example:
+        >>> Klass.objects.annotate(Klass.my_property, is_whatever=(Klass.my_property == 'whatever'))
+        >>> Klass.objects.annotate(Klass.my_method(1).a('_method_1')).values('_method_1')
+
+        """
+        common_args = []
+        annotations = {}
+        for arg in args:
+            if isinstance(arg, HybridExpression):
+                hybrid_expressions = [arg]
+            elif isinstance(arg, HybridExpressionVariants):
+                hybrid_expressions = list(arg)
+            else:
+                common_args.append(arg)
+                continue
+            for hybrid_expression in hybrid_expressions:
+                alias = hybrid_expression.alias or self._positional_alias(hybrid_expression)
+                if alias in annotations or alias in kwargs:
+                    raise ValueError(
+                        f'Annotation "{alias}" is given more than once, give each of them a different alias via `.a()`'
+                    )
+                annotations[alias] = hybrid_expression
+        annotations.update(kwargs)
+
+        clone = self
+        hybrid_aliases = {}
+        for alias, value in annotations.items():
+            if isinstance(value, HybridExpression):
+                hybrid_aliases[alias] = value
+                annotations[alias] = value.expression()
+            elif _contains_hybrid_lookups(value):
+                clone, (value,) = annotate_hybrid_lookups(clone, value)
+                annotations[alias] = models.Case(
+                    models.When(value, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField(),
+                )
+
+        clone = super(HybridQuerySetMixin, clone).annotate(*common_args, **annotations)
+        clone._hybrid_aliases.update(hybrid_aliases)
+        if any(x.startswith(HYBRID_VALUE_PREFIX) for x in annotations) and clone._iterable_class is models.query.ModelIterable:
+            clone._iterable_class = HybridModelIterable
+        return clone
+
+    def _positional_alias(self, hybrid_expression):
+        if hybrid_expression.through_path or hybrid_expression.window is not None or (
+            not issubclass(self.model, hybrid_expression.model)
+        ):
+            raise ValueError(
+                f'{hybrid_expression.model.__name__}.{hybrid_expression.name} is not read by {self.model.__name__} instances '
+                f'(it is a window, or a hybrid of another model), give it an alias via `.a()`'
+            )
+        return _hybrid_value_alias(hybrid_expression.name, hybrid_expression.callable_args, hybrid_expression.callable_kwargs)
+
+    def order_by(self, *field_names):
+        field_names = [x.expression() if isinstance(x, HybridExpression) else x for x in field_names]
+        return super().order_by(*field_names)
+
+    def get_or_create(self, *args, defaults=None, **kwargs):
+        """Same as `QuerySet.get_or_create()`, but also accepting (positional) hybrid comparisons to look the object up.
+
+        :Example:
+        >>> Klass.objects.get_or_create(Klass.my_property == 'whatever', my_field=1, defaults={'other_field': 2})
+
+        """
+        args, defaults = _split_defaults(args, defaults)
+        if args:
+            return self.filter(*args).get_or_create(defaults=defaults, **kwargs)
+        return super().get_or_create(defaults=defaults, **kwargs)
+
+    def update_or_create(self, *args, defaults=None, **kwargs):
+        """Same as `QuerySet.update_or_create()`, but also accepting (positional) hybrid comparisons to look the object up."""
+        args, defaults = _split_defaults(args, defaults)
+        if args:
+            return self.filter(*args).update_or_create(defaults=defaults, **kwargs)
+        return super().update_or_create(defaults=defaults, **kwargs)
+
+    async def aget(self, *args, **kwargs):
+        """Async version of `get()`, accepting hybrid comparisons as well."""
+        return await sync_to_async(self.get, thread_sensitive=True)(*args, **kwargs)
+
+    async def acount(self, *args, **kwargs):
+        """Async version of `count()`. Filters (including hybrid comparisons) may be passed directly."""
+        return await sync_to_async(self.filter(*args, **kwargs).count, thread_sensitive=True)()
+
+    async def aexists(self, *args, **kwargs):
+        """Async version of `exists()`. Filters (including hybrid comparisons) may be passed directly."""
+        return await sync_to_async(self.filter(*args, **kwargs).exists, thread_sensitive=True)()
+
+    if not hasattr(models.QuerySet, '__aiter__'):  # Django < 4.1, which has no native async iteration
+        def __aiter__(self):
+            """Async iteration (`async for`), streaming rows in chunks unless results are cached or prefetched."""
+            async def generator():
+                if self._result_cache is None and (self._hybrid_cache is not None or self._prefetch_related_lookups):
+                    await sync_to_async(self._fetch_all, thread_sensitive=True)()
+                if self._result_cache is not None:
+                    for item in self._result_cache:
+                        yield item
+                    return
+                async for chunk in _aiter_chunks(self, ASYNC_CHUNK_SIZE):
+                    for item in chunk:
+                        yield item
+            return generator()
+
+    def with_hybrids(self, *hybrids):
+        """Compute hybrid attributes in SQL, so the instances returned read them instead of computing them in Python.
+
+        Values are discarded (computed in Python again) once a field of the instance changes or on `refresh_from_db()`,
+        but not when other rows they depend on (related objects, for instance) change.
+
+        :param hybrids: class-level hybrid attributes (hybrid methods must be called with the arguments to be precomputed).
+
+        :Example:
+        >>> for obj in Klass.objects.with_hybrids(Klass.my_property, Klass.my_method(1)):
+        ...     print(obj.my_property, obj.my_method(1))  # No Python-side computation
+
+        """
+        return annotate_hybrid_values(self, hybrids)
+
+    def to_columns(self, *columns, backend='array', chunk_size=2000):
+        """Export hybrid values (and fields) of this queryset as typed arrays, one per column.
+
+        Rows are streamed from the database in chunks (using server-side cursors, when supported) straight into arrays
+        preallocated after a `count()` query, so no model instances nor per-row objects are kept around.
+        Array types come from the `output_field` of each column: integers (int64), floats and decimals (float64) and
+        booleans. Other types (strings, dates...) are exported as plain lists (or `object` arrays for NumPy).
+
+        :param columns: class-level hybrid attributes (hybrid methods must be called) or field names. Hybrids are keyed by
+            their alias (if any) or name.
+        :param backend: [optional] 'array' (stdlib `array.array`) or 'numpy' (`numpy.ndarray`, NumPy must be installed).
+        :param chunk_size: [optional] number of rows fetched from the database cursor at a time. Defaults to 2000.
+        :rtype: dict
+
+        :Example:
+        >>> columns = Klass.objects.to_columns('pk', Klass.my_property, Klass.my_method(1).a('my_method_1'), backend='numpy')
+        >>> columns['my_property'].mean()
+
+        """
+        return export_columns(self, columns, backend=backend, chunk_size=chunk_size)
+
+    def explain_hybrids(self, format=None, **options):
+        """Explain this queryset, mapping the query plan nodes back to the hybrids which were used to filter it.
+
+        Full scans, sorts caused by DISTINCT and repeated (correlated) subplans are flagged.
+
+        :param format: [optional] format passed to `QuerySet.explain()`.
+        :param options: [optional] backend-specific options passed to `QuerySet.explain()` (`analyze=True`, for instance).
+        :rtype: django_hybrid_attributes.explain.HybridExplanation
+
+        :Example:
+        >>> explanation = Klass.objects.filter(Klass.my_property == 'whatever').explain_hybrids()
+        >>> print(explanation)
+        >>> explanation.hybrids['Klass.my_property']
+        >>> explanation.full_scans
+
+        """
+        return explain_hybrids(self, self._hybrid_aliases, format=format, **options)
+
 
 class HybridQuerySet(HybridQuerySetMixin, models.QuerySet):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _hybrid_queryset_class(queryset_class):
+    """Hybrid version of a queryset class, so custom querysets (and their methods) are preserved by hybrid managers."""
+    if issubclass(queryset_class, HybridQuerySetMixin):
+        return queryset_class
+    if queryset_class is models.QuerySet:
+        return HybridQuerySet
+    return type(f'Hybrid{queryset_class.__name__}', (HybridQuerySetMixin, queryset_class), {})
+
+
 class HybridManagerMixin(object):
     def get_queryset(self):
-        return HybridQuerySet(self.model, using=self._db)
+        return _hybrid_queryset_class(self._queryset_class)(model=self.model, using=self._db, hints=self._hints)
 
     def filter(self, *args, **kwargs):
         return self.get_queryset().filter(*args, **kwargs)
 
+    def exclude(self, *args, **kwargs):
+        return self.get_queryset().exclude(*args, **kwargs)
+
+    def annotate(self, *args, **kwargs):
+        return self.get_queryset().annotate(*args, **kwargs)
+
+    def order_by(self, *field_names):
+        return self.get_queryset().order_by(*field_names)
+
+    def get_or_create(self, *args, defaults=None, **kwargs):
+        return self.get_queryset().get_or_create(*args, defaults=defaults, **kwargs)
+
+    def update_or_create(self, *args, defaults=None, **kwargs):
+        return self.get_queryset().update_or_create(*args, defaults=defaults, **kwargs)
+
+    async def aget(self, *args, **kwargs):
+        return await self.get_queryset().aget(*args, **kwargs)
+
+    async def acount(self, *args, **kwargs):
+        return await self.get_queryset().acount(*args, **kwargs)
+
+    async def aexists(self, *args, **kwargs):
+        return await self.get_queryset().aexists(*args, **kwargs)
+
+    def cached(self, timeout=DEFAULT_TIMEOUT, cache_alias='default'):
+        return self.get_queryset().cached(timeout=timeout, cache_alias=cache_alias)
+
+    def with_hybrids(self, *hybrids):
+        return self.get_queryset().with_hybrids(*hybrids)
+
+    def to_columns(self, *columns, backend='array', chunk_size=2000):
+        return self.get_queryset().to_columns(*columns, backend=backend, chunk_size=chunk_size)
+
+    def explain_hybrids(self, format=None, **options):
+        return self.get_queryset().explain_hybrids(format=format, **options)
+
 
 class HybridManager(HybridManagerMixin, models.Manager):
     pass
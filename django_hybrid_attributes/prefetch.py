@@ -0,0 +1,83 @@
+from django.db import models
+
+from .core import HYBRID_VALUE_PREFIX, HybridExpression, HybridExpressionVariants, _hybrid_value_alias
+from .decorators import _set_hybrid_values
+
+
+class HybridModelIterable(models.query.ModelIterable):
+    """Iterable that moves hybrid values annotated by `annotate_hybrid_values()` to where hybrid descriptors read them."""
+
+    def __iter__(self):
+        aliases = [x for x in self.queryset.query.annotation_select if x.startswith(HYBRID_VALUE_PREFIX)]
+        for obj in super().__iter__():
+            if aliases:
+                _set_hybrid_values(obj, {x: obj.__dict__.pop(x) for x in aliases})
+            yield obj
+
+
+def _resolve_hybrids(hybrids):
+    # Hybrid methods without arguments may be passed uncalled (`Klass.my_method` instead of `Klass.my_method()`), and
+    # variants (`Klass.my_method.many([...])`) stand for each of their hybrid expressions.
+    resolved = []
+    for hybrid in hybrids:
+        if isinstance(hybrid, HybridExpressionVariants):
+            resolved.extend(hybrid)
+        else:
+            resolved.append(hybrid if isinstance(hybrid, HybridExpression) else hybrid())
+    return resolved
+
+
+def annotate_hybrid_values(queryset, hybrids):
+    """Annotate hybrid expressions to a queryset so its instances read hybrid values from SQL instead of computing them.
+
+    Most likely you want to use `HybridQuerySetMixin.with_hybrids()` or `HybridPrefetch` instead.
+
+    :param queryset: queryset whose model declares the hybrids.
+    :param hybrids: class-level hybrid attributes (hybrid methods must be called with the arguments to be precomputed).
+
+    """
+    annotations = {}
+    hybrid_aliases = {}
+    for hybrid_expression in _resolve_hybrids(hybrids):
+        assert issubclass(queryset.model, hybrid_expression.model), (
+            f'{hybrid_expression.model.__name__}.{hybrid_expression.name} is not a hybrid of {queryset.model.__name__}'
+        )
+        assert not hybrid_expression.through_path, 'Hybrids with `.through()` relations cannot be precomputed'
+        alias = _hybrid_value_alias(hybrid_expression.name, hybrid_expression.callable_args, hybrid_expression.callable_kwargs)
+        annotations[alias] = hybrid_expression.expression()
+        hybrid_aliases[alias] = hybrid_expression
+
+    queryset = queryset.annotate(**annotations)
+    if hasattr(queryset, '_hybrid_aliases'):
+        queryset._hybrid_aliases.update(hybrid_aliases)
+    if queryset._iterable_class is models.query.ModelIterable:
+        queryset._iterable_class = HybridModelIterable
+    return queryset
+
+
+class HybridPrefetch(models.Prefetch):
+    """Prefetch whose queryset computes hybrid attributes in SQL for the related objects.
+
+    Related instances then read the precomputed values from their hybrid descriptors, so evaluating hybrids on
+    prefetched objects costs no extra queries.
+
+    :param lookup: same as `Prefetch` lookup.
+    :param queryset: [optional] same as `Prefetch` queryset. Defaults to the default manager of the hybrids model.
+    :param to_attr: [optional] same as `Prefetch` to_attr.
+    :param hybrids: class-level hybrid attributes of the related model to be computed in SQL.
+
+    :Example:
+    >>> qs = Student.objects.prefetch_related(
+    ...     HybridPrefetch('studentclassroom_set', hybrids=[StudentClassroom.passed, StudentClassroom.get_grade_as_percent])
+    ... )
+    >>> [[x.passed for x in student.studentclassroom_set.all()] for student in qs]  # No queries per object
+
+    """
+
+    def __init__(self, lookup, queryset=None, to_attr=None, hybrids=()):
+        hybrids = _resolve_hybrids(hybrids)
+        if hybrids:
+            if queryset is None:
+                queryset = hybrids[0].model._default_manager.all()
+            queryset = annotate_hybrid_values(queryset, hybrids)
+        super().__init__(lookup, queryset=queryset, to_attr=to_attr)
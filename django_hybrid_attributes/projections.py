@@ -0,0 +1,267 @@
+import itertools
+import time
+
+from django.apps import apps
+from django.db import connections, models, router, transaction
+from django.utils.functional import cached_property
+
+from .cache import _invalidate_model
+from .core import HYBRID_VALUE_PREFIX, _hybrid_value_alias, _projected_columns
+from .prefetch import _resolve_hybrids
+
+APP_LABEL = 'django_hybrid_attributes'
+
+_AUTO_FIELD_TYPES = {'AutoField', 'BigAutoField', 'SmallAutoField'}
+_COLUMN_FIELD_IGNORED_KWARGS = (
+    'primary_key', 'unique', 'db_index', 'db_column', 'db_tablespace', 'default', 'choices', 'validators', 'verbose_name',
+)
+
+# Seconds before checking again whether a missing projection table was created (by another process, for instance)
+TABLE_CHECK_INTERVAL = 60
+
+_projections = {}
+
+
+def get_projections():
+    """Mapping of name to `HybridProjection` of every projection declared so far."""
+    return dict(_projections)
+
+
+def _column_name(hybrid_expression):
+    alias = _hybrid_value_alias(hybrid_expression.name, hybrid_expression.callable_args, hybrid_expression.callable_kwargs)
+    return alias[len(HYBRID_VALUE_PREFIX):].replace('__', '_')  # Field names can't contain `__`
+
+
+def _aggregates(expression):
+    """Aggregates computed by a (resolved) expression, including those selected by its subqueries."""
+    query = getattr(expression, 'query', None) or getattr(getattr(expression, 'queryset', None), 'query', None)
+    sources = list(query.annotation_select.values()) if query is not None else []
+    if hasattr(expression, 'get_source_expressions'):  # Lookups of `When()` may hold `Query` objects, for instance
+        sources += expression.get_source_expressions()
+    for source in sources:
+        if isinstance(source, models.Aggregate):
+            yield source
+        yield from _aggregates(source)
+
+
+def _column_field(expression):
+    """Nullable model field able to store values of a (resolved) expression."""
+    output_field = expression.output_field
+    # Before Django 3.0, subqueries report the field of their first selected column (the grouping one, for aggregates
+    # over relations) and averages may be reported with the field they average, so the aggregate field is used instead.
+    aggregates = list(_aggregates(expression))
+    if len(aggregates) == 1 and (output_field.is_relation or isinstance(aggregates[0], models.Avg)):
+        output_field = aggregates[0].output_field
+
+    while output_field.is_relation:
+        output_field = output_field.target_field
+    internal_type = output_field.get_internal_type()
+    if internal_type in _AUTO_FIELD_TYPES:
+        return models.BigIntegerField(null=True)
+    if isinstance(output_field, models.CharField):  # Computed strings may be longer than the fields they come from
+        return models.TextField(null=True)
+
+    _, _, args, kwargs = output_field.deconstruct()
+    for kwarg in _COLUMN_FIELD_IGNORED_KWARGS:
+        kwargs.pop(kwarg, None)
+    kwargs['null'] = True
+    return output_field.__class__(*args, **kwargs)
+
+
+class HybridProjection(object):
+    """Materialization of hybrid values of a model into a summary table keyed by the model primary key.
+
+    Once declared, class-level usage of the projected hybrids (comparisons, `.e()`, `.with_hybrids()`...) reads the
+    stored values through a LEFT JOIN instead of computing the hybrid expressions, which is handy for expensive
+    cross-model hybrids. Stored values are as fresh as the last refresh (`refresh()` or the `refresh_hybrid_views`
+    management command); use `.live()` on a hybrid to compute it from its definition anyway.
+
+    A real table is used on every backend (instead of a materialized view on the backends that support them), so it
+    can be refreshed incrementally, and it is created by the first refresh. Until then, hybrids are computed from their
+    definitions (whether the table exists in the database for reading the projected model is checked again every
+    `TABLE_CHECK_INTERVAL` seconds).
+
+    :param model: model which declares the hybrids.
+    :param hybrids: class-level hybrid attributes to be materialized (hybrid methods must be called with the arguments to
+        be materialized, and `.through()` is not supported).
+    :param name: [optional] name of the projection. Defaults to `<model_name>_hybrids`.
+    :param db_table: [optional] name of the table. Defaults to `<model db_table>_hybrids`.
+
+    :Example:
+    >>> student_summary = HybridProjection(Student, [Student.get_status, Student.average_grade])
+    >>> student_summary.refresh()  # or `./manage.py refresh_hybrid_views`
+    >>> Student.objects.filter(Student.get_status == 'passed')  # reads the summary table through a join
+
+    """
+
+    def __init__(self, model, hybrids, name=None, db_table=None):
+        self.source_model = model
+        self.name = name or f'{model._meta.model_name}_hybrids'
+        self.db_table = db_table or f'{model._meta.db_table}_hybrids'
+        self.related_name = f'_hybrid_projection_{self.name}'
+        self._table_checks = {}  # {database alias: True if the table exists, or when it was found missing}
+        assert self.name not in _projections, f'Projection "{self.name}" is already declared'
+
+        self.columns = {}
+        for hybrid_expression in _resolve_hybrids(hybrids):
+            assert issubclass(model, hybrid_expression.model), (
+                f'{hybrid_expression.model.__name__}.{hybrid_expression.name} is not a hybrid of {model.__name__}'
+            )
+            assert not hybrid_expression.through_path, 'Hybrids with `.through()` relations cannot be projected'
+            assert hybrid_expression.window is None, 'Window functions cannot be projected'
+            assert hybrid_expression._signature() not in _projected_columns, (
+                f'{hybrid_expression.model.__name__}.{hybrid_expression.name} is already projected'
+            )
+            self.columns[_column_name(hybrid_expression)] = hybrid_expression.live()
+
+        _projections[self.name] = self
+        for column, hybrid_expression in self.columns.items():
+            _projected_columns[hybrid_expression._signature()] = (self, column)
+
+    def __repr__(self):
+        return f'<HybridProjection {self.name!r} columns={list(self.columns)}>'
+
+    @cached_property
+    def model(self):
+        """Unmanaged model of the projection table, with a one-to-one relation to the projected model."""
+        queryset = self.source_model._base_manager.annotate(**self._live_expressions())
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), {'app_label': APP_LABEL, 'db_table': self.db_table, 'managed': False}),
+            'source': models.OneToOneField(
+                self.source_model,
+                primary_key=True,
+                on_delete=models.DO_NOTHING,
+                db_constraint=False,
+                related_name=self.related_name,
+            ),
+        }
+        for column in self.columns:
+            attrs[column] = _column_field(queryset.query.annotations[column])
+
+        class_name = ''.join(x.capitalize() for x in self.name.split('_')) + 'Projection'
+        return type(class_name, (models.Model,), attrs)
+
+    def _column_path(self, column):
+        self.model  # The reverse relation exists only once the projection model is built
+        return f'{self.related_name}__{column}'
+
+    def _live_expressions(self):
+        return {column: hybrid_expression.expression() for column, hybrid_expression in self.columns.items()}
+
+    def _live_queryset(self, using):
+        queryset = self.source_model._base_manager.using(using).order_by()
+        return queryset.annotate(**self._live_expressions()).values_list('pk', *self.columns)
+
+    def _insert_from_select(self, cursor, queryset):
+        connection = cursor.db
+        qn = connection.ops.quote_name
+        sql, params = queryset.query.sql_with_params()
+        fields = [self.model._meta.pk.column, *self.columns]  # Same order as the selected columns of `_live_queryset()`
+        cursor.execute(f'INSERT INTO {qn(self.db_table)} ({", ".join(qn(x) for x in fields)}) {sql}', params)
+        return cursor.rowcount
+
+    def table_exists(self, using=None):
+        """Whether the projection table exists (so hybrids can be read from it).
+
+        :param using: [optional] database alias. Defaults to the database for reading the projected model.
+
+        """
+        using = using or router.db_for_read(self.source_model)
+        checked = self._table_checks.get(using)
+        if checked is True:
+            return True
+        if checked is not None and time.monotonic() - checked < TABLE_CHECK_INTERVAL:
+            return False
+
+        exists = self.db_table in connections[using].introspection.table_names()
+        self._table_checks[using] = True if exists else time.monotonic()
+        return exists
+
+    def create_table(self, using=None):
+        """Create the projection table, unless it exists already.
+
+        Note SQLite can't create tables inside a transaction (`transaction.atomic()` or `TestCase`, for instance).
+
+        """
+        using = using or router.db_for_write(self.source_model)
+        connection = connections[using]
+        if self.db_table not in connection.introspection.table_names():
+            with connection.schema_editor() as schema_editor:
+                schema_editor.create_model(self.model)
+        self._table_checks[using] = True
+
+    def drop_table(self, using=None):
+        """Drop the projection table, if it exists."""
+        using = using or router.db_for_write(self.source_model)
+        connection = connections[using]
+        if self.db_table in connection.introspection.table_names():
+            with connection.schema_editor() as schema_editor:
+                schema_editor.delete_model(self.model)
+        self._table_checks.pop(using, None)
+
+    def refresh(self, incremental=False, using=None, chunk_size=2000):
+        """Compute the projected hybrids and store them, creating the projection table if needed.
+
+        A full refresh rebuilds the whole table through a single `INSERT ... SELECT` statement. An incremental one only
+        writes differences: rows of deleted objects are removed, rows of new objects are inserted and rows whose values
+        changed are updated (values are compared in chunks of `chunk_size` objects).
+
+        :param incremental: [optional] only write differences instead of rebuilding the table. Defaults to False.
+        :param using: [optional] database alias. Defaults to the database for writing the projected model.
+        :param chunk_size: [optional] number of objects compared at a time on incremental refreshes. Defaults to 2000.
+        :return: number of rows written (inserted, updated or deleted).
+        :rtype: int
+
+        """
+        using = using or router.db_for_write(self.source_model)
+        self.create_table(using)
+        with transaction.atomic(using=using):
+            if incremental:
+                written = self._refresh_incremental(using, chunk_size)
+            else:
+                written = self._refresh_full(using)
+        _invalidate_model(self.model)
+        return written
+
+    def _refresh_full(self, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {connections[using].ops.quote_name(self.db_table)}')
+            return self._insert_from_select(cursor, self._live_queryset(using))
+
+    def _refresh_incremental(self, using, chunk_size):
+        stored = self.model._base_manager.using(using)
+        source_pks = self.source_model._base_manager.using(using).values('pk')
+        deleted, _ = stored.exclude(pk__in=source_pks).delete()
+
+        with connections[using].cursor() as cursor:
+            inserted = self._insert_from_select(cursor, self._live_queryset(using).exclude(pk__in=stored.values('pk')))
+
+        changed = []
+        rows = self._live_queryset(using).order_by('pk').iterator(chunk_size=chunk_size)
+        for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+            stored_rows = dict(
+                (x[0], x[1:]) for x in stored.filter(pk__in=[x[0] for x in chunk]).values_list('pk', *self.columns)
+            )
+            changed.extend(
+                self.model(source_id=x[0], **dict(zip(self.columns, x[1:])))
+                for x in chunk if x[0] in stored_rows and stored_rows[x[0]] != x[1:]
+            )
+        if changed and hasattr(stored, 'bulk_update'):
+            stored.bulk_update(changed, list(self.columns), batch_size=chunk_size)
+        elif changed:  # Django < 2.2
+            with transaction.atomic(using=using):
+                for obj in changed:
+                    stored.filter(pk=obj.pk).update(**{x: getattr(obj, x) for x in self.columns})
+
+        return deleted + inserted + len(changed)
+
+    def unregister(self):
+        """Stop reading the hybrids from this projection. The table (if any) is kept."""
+        for hybrid_expression in self.columns.values():
+            _projected_columns.pop(hybrid_expression._signature(), None)
+        _projections.pop(self.name, None)
+        if 'model' in self.__dict__:
+            del apps.all_models[APP_LABEL][self.model._meta.model_name]
+            apps.clear_cache()
+            del self.__dict__['model']
@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+# Sent every time a hybrid comparison is applied to a queryset (class-level usage).
+# Sender: the model which declares the hybrid attribute.
+# Arguments: `hybrid` (hybrid name), `alias`, `queryset`, `build_time` (seconds spent building the expression),
+# `apply_time` (seconds spent annotating/filtering the queryset), `sql` and `params` (the annotated SQL fragment).
+hybrid_filter_applied = Signal()
+
+# Sent every time a hybrid attribute is evaluated on a model instance (instance-level usage).
+# Sender: the model which declares the hybrid attribute.
+# Arguments: `hybrid` (hybrid name), `instance`, `duration` (seconds) and `queries` (number of queries executed).
+hybrid_attribute_accessed = Signal()
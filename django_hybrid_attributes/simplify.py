@@ -0,0 +1,83 @@
+import operator
+
+from django.db.models import functions
+from django.db.models.expressions import CombinedExpression, Value
+
+# Functions f for which f(f(x)) == f(x). Some of them don't exist in older Django versions.
+_IDEMPOTENT_FUNCTIONS = tuple(
+    getattr(functions, x) for x in ('Lower', 'Upper', 'Trim', 'LTrim', 'RTrim', 'Abs', 'Ceil', 'Floor', 'Sign')
+    if hasattr(functions, x)
+)
+_TRIM_FUNCTIONS = tuple(getattr(functions, x) for x in ('Trim', 'LTrim', 'RTrim') if hasattr(functions, x))
+
+# Integer division and modulo semantics differ between databases (and Python), so they are never folded.
+_FOLDABLE_OPERATORS = {
+    CombinedExpression.ADD: operator.add,
+    CombinedExpression.SUB: operator.sub,
+    CombinedExpression.MUL: operator.mul,
+}
+_NUMBER_TYPES = (int, float)
+
+
+def _explicit_output_field(expression):
+    return expression.__dict__.get('output_field')
+
+
+def _is_number_value(expression):
+    return type(expression) is Value and isinstance(expression.value, _NUMBER_TYPES) and not isinstance(expression.value, bool)
+
+
+def _fold_constants(expression):
+    lhs, rhs = expression.lhs, expression.rhs
+    folding = _FOLDABLE_OPERATORS.get(expression.connector)
+    if folding is None or not _is_number_value(lhs) or not _is_number_value(rhs):
+        return expression
+    output_field = _explicit_output_field(expression) or _explicit_output_field(lhs) or _explicit_output_field(rhs)
+    return Value(folding(lhs.value, rhs.value), output_field=output_field)
+
+
+def _collapse_wrapper(expression):
+    source_expressions = expression.get_source_expressions()
+    if len(source_expressions) != 1 or _explicit_output_field(expression):
+        return expression
+    inner = source_expressions[0]
+    if type(inner) is type(expression):  # f(f(x)) -> f(x)
+        return inner
+    if not _TRIM_FUNCTIONS:
+        return expression
+    if isinstance(expression, _TRIM_FUNCTIONS) and type(inner) is functions.Trim:  # ltrim(trim(x)) -> trim(x)
+        return inner
+    if type(expression) is functions.Trim and isinstance(inner, _TRIM_FUNCTIONS):  # trim(ltrim(x)) -> trim(x)
+        return expression.__class__(*inner.get_source_expressions())
+    return expression
+
+
+def simplify(expression):
+    """Normalize an (unresolved) expression tree, returning an equivalent one which is cheaper to evaluate.
+
+    Arithmetic between constant `Value`s (`+`, `-` and `*` of numbers) is folded and redundant wrappers of idempotent
+    functions (`Lower(Lower(x))`, `Trim(LTrim(x))`...) are collapsed. The given expression is not modified.
+
+    :param expression: expression to be simplified. Anything else (`Q`, plain values...) is returned untouched.
+
+    :Example:
+    >>> simplify(Lower(Lower('name')))
+    Lower(F(name))
+    >>> simplify(F('price') * (Value(2) + Value(3)))
+    F(price) * Value(5)
+
+    """
+    if not hasattr(expression, 'get_source_expressions'):
+        return expression
+
+    source_expressions = expression.get_source_expressions()
+    simplified = [simplify(x) for x in source_expressions]
+    if any(x is not y for x, y in zip(simplified, source_expressions)):
+        expression = expression.copy()
+        expression.set_source_expressions(simplified)
+
+    if type(expression) is CombinedExpression:
+        return _fold_constants(expression)
+    if isinstance(expression, _IDEMPOTENT_FUNCTIONS + _TRIM_FUNCTIONS):
+        return _collapse_wrapper(expression)
+    return expression
@@ -1,6 +1,23 @@
 import inspect
 
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
 from .core import HybridExpression
+from .managers import _aiter_chunks, sync_to_async
+
+
+def _resolve_hybrid_expression(hybrid_attribute, f_args, f_kwargs):
+    if not isinstance(hybrid_attribute, HybridExpression):
+        hybrid_attribute = hybrid_attribute(*f_args, **f_kwargs)
+    return hybrid_attribute.live()  # Checks the hybrid definition itself, not values stored by a `HybridProjection`
+
+
+def _evaluate_instance_side(obj, hybrid_expression):
+    function_result = getattr(obj, hybrid_expression.name)
+    if inspect.ismethod(function_result):
+        function_result = function_result(*hybrid_expression.callable_args, **hybrid_expression.callable_kwargs)
+    return function_result
 
 
 def assert_hybrid_attributes_are_consistent(hybrid_attribute, *f_args, **f_kwargs):
@@ -24,25 +41,173 @@ def assert_hybrid_attributes_are_consistent(hybrid_attribute, *f_args, **f_kwarg
     queryset = f_kwargs.pop('queryset', None)
     testcase_instance = f_kwargs.pop('_testcase_instance', None)
 
-    hybrid_expression = hybrid_attribute
-    if not isinstance(hybrid_expression, HybridExpression):
-        hybrid_expression = hybrid_expression(*f_args, **f_kwargs)
+    hybrid_expression = _resolve_hybrid_expression(hybrid_attribute, f_args, f_kwargs)
 
     if queryset is None:
-        queryset = hybrid_expression.callable.__self__.objects.all()
+        queryset = hybrid_expression.model.objects.all()
 
     for obj in queryset.annotate(hybrid_expression_result=hybrid_expression.e()):
-        expression_result = obj.hybrid_expression_result
+        _check_consistency(obj, hybrid_expression, testcase_instance)
+
+
+def _check_consistency(obj, hybrid_expression, testcase_instance):
+    expression_result = obj.hybrid_expression_result
+    function_result = _evaluate_instance_side(obj, hybrid_expression)
+
+    msg = f'Hybrid expression/function mismatch for id={obj.id}. Expr="{expression_result}" x Func="{function_result}"'
+    if testcase_instance:
+        testcase_instance.assertEqual(expression_result, function_result, msg)
+    else:
+        assert expression_result == function_result, msg
+
+
+async def aassert_hybrid_attributes_are_consistent(hybrid_attribute, *f_args, **f_kwargs):
+    """Async version of `assert_hybrid_attributes_are_consistent()`, meant to be awaited from async code (ASGI apps).
+
+    Rows are streamed in chunks (using a server-side cursor where supported), so the event loop is released between
+    chunks and memory usage does not grow with the queryset size.
+    Django database connections are bound to threads, so fetching and evaluating each chunk happen in the same
+    (thread-sensitive) worker thread.
+
+    Signature is a mirror of `assert_hybrid_attributes_are_consistent()`, plus:
+
+    :param chunk_size: [optional] number of rows fetched at a time. Defaults to 100.
+
+    :Example:
+    >>> await aassert_hybrid_attributes_are_consistent(Student.my_property)
+    >>> await aassert_hybrid_attributes_are_consistent(Student.my_method, arg1, arg2=2, chunk_size=1000)
+
+    :raises AssertionError: when instance- and class-level attributes mismatch.
+
+    """
+    queryset = f_kwargs.pop('queryset', None)
+    testcase_instance = f_kwargs.pop('_testcase_instance', None)
+    chunk_size = f_kwargs.pop('chunk_size', 100)
+
+    hybrid_expression = _resolve_hybrid_expression(hybrid_attribute, f_args, f_kwargs)
+
+    if queryset is None:
+        queryset = hybrid_expression.model.objects.all()
+    queryset = queryset.annotate(hybrid_expression_result=hybrid_expression.e())
+
+    def check_chunk(chunk):
+        for obj in chunk:
+            _check_consistency(obj, hybrid_expression, testcase_instance)
+
+    async for chunk in _aiter_chunks(queryset, chunk_size):
+        await sync_to_async(check_chunk, thread_sensitive=True)(chunk)
+
+
+class HybridQueryReport(object):
+    """Number of queries executed when evaluating the instance-level side of a hybrid attribute over a queryset."""
+
+    def __init__(self, hybrid_expression, per_row_queries):
+        self.hybrid_expression = hybrid_expression
+        self.per_row_queries = per_row_queries
+
+    @property
+    def rows(self):
+        return len(self.per_row_queries)
+
+    @property
+    def queries(self):
+        return sum(self.per_row_queries)
+
+    @property
+    def scales_linearly(self):
+        """Whether the number of queries grows with the number of rows (N+1).
+
+        Rows are split in halves: queries scale linearly when the later rows keep issuing queries (at least half as many
+        as the earlier ones), even if some rows issue none. Queries of the first rows only (warming a cache, for
+        instance) don't scale.
+        """
+        earlier = sum(self.per_row_queries[:self.rows // 2])
+        later = sum(self.per_row_queries[self.rows // 2:])
+        return self.rows > 1 and later > 0 and later * 2 >= earlier
+
+    def __str__(self):
+        label = f'{self.hybrid_expression.model.__name__}.{self.hybrid_expression.name}'
+        scaling = ' (scales linearly with row count)' if self.scales_linearly else ''
+        return f'{label}: {self.queries} queries for {self.rows} rows{scaling}'
+
+
+def measure_hybrid_queries(hybrid_attribute, queryset=None, *f_args, **f_kwargs):
+    """Evaluate the instance-level side of a hybrid attribute over a queryset, counting the queries executed for each row.
+
+    Queries needed to fetch the queryset itself are not taken into account.
+
+    :param hybrid_attribute: class-level attribute whose relative instance-level attribute will be evaluated.
+    :param queryset: [optional] queryset to evaluate against. If omitted, Klass.objects.all() will be used.
+    :param f_args: [optional] positional arguments that will be passed to the instance-level attribute.
+    :param f_kwargs: [optional] keyword arguments that will be passed to the instance-level attribute.
+    :rtype: HybridQueryReport
+
+    :Example:
+    >>> report = measure_hybrid_queries(Student.my_method, Student.objects.all(), arg1, arg2=2)
+    >>> report.queries, report.scales_linearly
+
+    """
+    hybrid_expression = _resolve_hybrid_expression(hybrid_attribute, f_args, f_kwargs)
+
+    if queryset is None:
+        queryset = hybrid_expression.model.objects.all()
+
+    per_row_queries = []
+    with CaptureQueriesContext(connections[queryset.db]) as context:
+        for obj in list(queryset):
+            before = len(context)
+            _evaluate_instance_side(obj, hybrid_expression)
+            per_row_queries.append(len(context) - before)
+
+    return HybridQueryReport(hybrid_expression, per_row_queries)
+
+
+def find_linear_hybrids(*hybrid_attributes, queryset=None):
+    """Get reports of the hybrid attributes whose instance-level side issues queries growing with rows (N+1).
+
+    Hybrid methods requiring arguments must be passed already called (`Klass.my_method(arg1)`).
+
+    :param hybrid_attributes: class-level attributes to be checked.
+    :param queryset: [optional] queryset to evaluate against. If omitted, Klass.objects.all() will be used.
+    :rtype: list of HybridQueryReport
+
+    :Example:
+    >>> for report in find_linear_hybrids(Student.full_name, Student.get_status, Student.my_method(arg1)):
+    ...     print(report)
+
+    """
+    reports = [measure_hybrid_queries(x, queryset) for x in hybrid_attributes]
+    return [x for x in reports if x.scales_linearly]
+
+
+def assert_hybrid_query_budget(hybrid_attribute, queryset=None, *f_args, max_queries=0, **f_kwargs):
+    """Assert that evaluating the instance-level side of a hybrid attribute over a queryset fits a query budget.
+
+    Use it as a standalone helper (in a sanity script of some sort, for example).
+    In order to use it inside a `unittest.TestCase`, consider using `HybridTestCaseMixin.assertHybridQueryBudget`.
+
+    :param hybrid_attribute: class-level attribute whose relative instance-level attribute will be evaluated.
+    :param queryset: [optional] queryset to evaluate against. If omitted, Klass.objects.all() will be used.
+    :param max_queries: [optional] maximum number of queries allowed (not counting the queryset fetch). Defaults to 0.
+    :param f_args: [optional] positional arguments that will be passed to the instance-level attribute.
+    :param f_kwargs: [optional] keyword arguments that will be passed to the instance-level attribute.
+
+    :Example:
+    >>> assert_hybrid_query_budget(Student.my_property, Student.objects.all())
+    >>> assert_hybrid_query_budget(Student.my_method, Student.objects.all(), arg1, arg2=2, max_queries=1)
+
+    :raises AssertionError: when the instance-level attribute executes more queries than allowed.
 
-        function_result = getattr(obj, hybrid_expression.callable.__name__)
-        if inspect.ismethod(function_result):
-            function_result = function_result(*f_args, **f_kwargs)
+    """
+    testcase_instance = f_kwargs.pop('_testcase_instance', None)
+
+    report = measure_hybrid_queries(hybrid_attribute, queryset, *f_args, **f_kwargs)
 
-        msg = f'Hybrid expression/function mismatch for id={obj.id}. Expr="{expression_result}" x Func="{function_result}"'
-        if testcase_instance:
-            testcase_instance.assertEqual(expression_result, function_result, msg)
-        else:
-            assert expression_result == function_result, msg
+    msg = f'Hybrid query budget exceeded. {report}, but only {max_queries} allowed'
+    if testcase_instance:
+        testcase_instance.assertLessEqual(report.queries, max_queries, msg)
+    else:
+        assert report.queries <= max_queries, msg
 
 
 class HybridTestCaseMixin(object):
@@ -62,3 +227,35 @@ class HybridTestCaseMixin(object):
         """
         kwargs['_testcase_instance'] = self
         assert_hybrid_attributes_are_consistent(*args, **kwargs)
+
+    async def aassertHybridAttributesAreConsistent(self, *args, **kwargs):
+        """Unittest helper method that wraps `aassert_hybrid_attributes_are_consistent()` capabilities.
+
+        Signature is a mirror of `aassert_hybrid_attributes_are_consistent()`.
+
+        :Example:
+        >>> class MyTest(HybridTestCaseMixin, django.test.TestCase):
+        ...     async def test_hybrid_attributes_consistent(self):
+        ...         # <Create you Klass() instances>
+        ...         await self.aassertHybridAttributesAreConsistent(Klass.my_property)
+
+        """
+        kwargs['_testcase_instance'] = self
+        await aassert_hybrid_attributes_are_consistent(*args, **kwargs)
+
+    def assertHybridQueryBudget(self, *args, **kwargs):
+        """Unittest helper method that wraps `assert_hybrid_query_budget()` capabilities.
+
+        Signature is a mirror of `assert_hybrid_query_budget()`.
+
+        :Example:
+        >>> import unittest
+        >>> class MyTest(HybridTestCaseMixin, unittest.TestCase):
+        ...     def test_hybrid_attributes_do_not_cause_n_plus_one(self):
+        ...         # <Create you Klass() instances>
+        ...         self.assertHybridQueryBudget(Klass.my_property, Klass.objects.all())
+        ...         self.assertHybridQueryBudget(Klass.my_method, Klass.objects.all(), arg1, arg2=2, max_queries=1)
+
+        """
+        kwargs['_testcase_instance'] = self
+        assert_hybrid_query_budget(*args, **kwargs)
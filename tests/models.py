@@ -1,7 +1,7 @@
 from django.core.validators import MaxValueValidator
 from django.db import models
 
-from django_hybrid_attributes import HybridManager, HybridQuerySet, hybrid_method, hybrid_property
+from django_hybrid_attributes import HybridManager, HybridQuerySet, hybrid_aggregate, hybrid_method, hybrid_property
 
 
 class Student(models.Model):
@@ -87,6 +87,10 @@ class Student(models.Model):
             output_field=models.CharField()
         )
 
+    average_grade = hybrid_aggregate('studentclassroom', models.Avg('grade'))
+    classrooms_count = hybrid_aggregate('studentclassroom', models.Count('id'))
+    failed_classrooms_count = hybrid_aggregate('studentclassroom', models.Count('id', filter=models.Q(grade__lt=7)))
+
     # NOTE: 4 methods below are wrong by design, as we want to test the error scenarios in assert_hybrid_attributes_are_consistent.
 
     @hybrid_property
@@ -0,0 +1,118 @@
+from django.contrib import admin
+from django.contrib.admin.templatetags.admin_list import result_headers, results
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase
+
+from django_hybrid_attributes.admin import HybridAdminMixin, HybridListFilter
+from django_hybrid_attributes.core import _hybrid_value_alias
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class StudentAdmin(HybridAdminMixin, admin.ModelAdmin):
+    actions = None
+    list_display = ('first_name', 'full_name', 'get_status', 'average_grade')
+    list_display_links = None
+    list_filter = (HybridListFilter.create(Student.get_status(), [('passed', 'Passed'), ('failed', 'Failed')]),)
+
+
+class StudentClassroomAdmin(HybridAdminMixin, admin.ModelAdmin):
+    list_display = ('grade', 'passed', 'get_grade_as_percent')
+
+
+class HybridAdminTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        teacher = Teacher.objects.create(first_name='Jon', last_name='Snow')
+        self.classroom = Classroom.objects.create(name='IT', teacher=teacher)
+        self.model_admin = StudentAdmin(Student, admin.AdminSite())
+
+    def _create_student(self, first_name, *grades):
+        student = Student.objects.create(magic_number1=1, magic_number2=2, first_name=first_name, last_name='Smith')
+        for grade in grades:
+            StudentClassroom.objects.create(student=student, classroom=self.classroom, grade=grade)
+        return student
+
+    def _get_rows(self, **params):
+        request = RequestFactory().get('/', params)
+        request.user = AnonymousUser()
+        changelist = self.model_admin.get_changelist_instance(request)
+        changelist.formset = None
+        return [[str(cell) for cell in row] for row in results(changelist)]
+
+    def test_hybrid_columns(self):
+        self.assertEqual(list(self.model_admin.list_display_hybrids), ['full_name', 'get_status', 'average_grade'])
+        self._create_student('Agent', 6, 8)
+        self._create_student('Filipe', 9, 10)
+
+        rows = self._get_rows(o='1')
+        self.assertEqual(len(rows), 2)
+        self.assertIn('Agent Smith', rows[0][1])
+        self.assertIn('failed', rows[0][2])
+        self.assertIn('7.0', rows[0][3])
+        self.assertIn('Filipe Smith', rows[1][1])
+        self.assertIn('passed', rows[1][2])
+        self.assertIn('9.5', rows[1][3])
+
+    def test_number_of_queries_does_not_depend_on_rows(self):
+        self._create_student('Agent', 6)
+        with self.assertNumQueries(3):  # COUNT(*) of the filtered and of the whole queryset, then the page itself
+            self._get_rows()
+
+        for i in range(10):
+            self._create_student(f'Student {i}', i, 10 - i)
+        with self.assertNumQueries(3):
+            rows = self._get_rows()
+        self.assertEqual(len(rows), 11)
+
+    def test_sorting(self):
+        self._create_student('Agent', 5)
+        self._create_student('Filipe', 9)
+        self._create_student('Jon', 7)
+
+        request = RequestFactory().get('/', {'o': '-3'})
+        request.user = AnonymousUser()
+        changelist = self.model_admin.get_changelist_instance(request)
+        self.assertEqual([x.first_name for x in changelist.result_list], ['Filipe', 'Jon', 'Agent'])
+        self.assertTrue(all(x['sortable'] for x in result_headers(changelist)))
+
+        self.assertEqual([x[0] for x in self._get_rows(o='2.-0')], [
+            '<td class="field-first_name">Agent</td>',
+            '<td class="field-first_name">Jon</td>',
+            '<td class="field-first_name">Filipe</td>',
+        ])
+
+    def test_list_filter(self):
+        self._create_student('Agent', 5)
+        self._create_student('Filipe', 9)
+
+        passed = self._get_rows(get_status='passed')
+        self.assertEqual(len(passed), 1)
+        self.assertIn('Filipe', passed[0][0])
+        failed = self._get_rows(get_status='failed')
+        self.assertEqual(len(failed), 1)
+        self.assertIn('Agent', failed[0][0])
+        self.assertEqual(len(self._get_rows()), 2)
+
+    def test_list_filter_on_plain_querysets(self):
+        self._create_student('Agent', 5)
+        self._create_student('Filipe', 9)
+        list_filter = HybridListFilter.create(StudentClassroom.passed, [True, False], parameter_name='passed')
+        self.assertEqual(list_filter.title, 'passed')
+
+        queryset = list_filter(None, {'passed': 'True'}, StudentClassroom, None).queryset(None, StudentClassroom.objects.all())
+        self.assertEqual([x.grade for x in queryset], [9])
+
+    def test_hybrid_methods_with_arguments(self):
+        class MagicNumberAdmin(HybridAdminMixin, admin.ModelAdmin):
+            list_display = ('first_name', 'magic_number1_times_n')
+
+        with self.assertRaises(ImproperlyConfigured):
+            MagicNumberAdmin(Student, admin.AdminSite())
+
+    def test_boolean_columns(self):
+        model_admin = StudentClassroomAdmin(StudentClassroom, admin.AdminSite())
+        self.assertTrue(model_admin.passed.boolean)
+        self.assertFalse(model_admin.get_grade_as_percent.boolean)
+        self.assertEqual(model_admin.get_grade_as_percent.admin_order_field, _hybrid_value_alias('get_grade_as_percent'))
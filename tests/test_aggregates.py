@@ -0,0 +1,87 @@
+from django.db import models
+from django.test import TestCase
+
+from django_hybrid_attributes.test_utils import HybridTestCaseMixin
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class HybridAggregateTestCase(HybridTestCaseMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom1 = Classroom.objects.create(name='Boring stuff', teacher=self.teacher)
+        self.classroom2 = Classroom.objects.create(name='IT and software development', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student3 = Student.objects.create(magic_number1=5, magic_number2=6, first_name='No', last_name='Classes')
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom1, grade=5)
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom2, grade=8)
+        StudentClassroom.objects.create(student=self.student2, classroom=self.classroom1, grade=9)
+
+    def test_hybrid_attributes_are_consistent(self):
+        self.assertHybridAttributesAreConsistent(Student.average_grade)
+        self.assertHybridAttributesAreConsistent(Student.classrooms_count)
+        self.assertHybridAttributesAreConsistent(Student.failed_classrooms_count)
+        prefetched = Student.objects.prefetch_related('studentclassroom_set')
+        self.assertHybridAttributesAreConsistent(Student.average_grade, queryset=prefetched)
+        self.assertHybridAttributesAreConsistent(Student.classrooms_count, queryset=prefetched)
+
+    def test_function(self):
+        self.assertEqual(self.student1.average_grade, 6.5)
+        self.assertEqual(self.student2.average_grade, 9)
+        self.assertEqual(self.student3.average_grade, None)
+        self.assertEqual(self.student1.classrooms_count, 2)
+        self.assertEqual(self.student3.classrooms_count, 0)
+        self.assertEqual(self.student1.failed_classrooms_count, 1)
+        self.assertEqual(self.student2.failed_classrooms_count, 0)
+
+    def test_function_is_prefetch_aware(self):
+        students = list(Student.objects.prefetch_related('studentclassroom_set').order_by('id'))
+        with self.assertNumQueries(0):
+            self.assertEqual([x.average_grade for x in students], [6.5, 9, None])
+            self.assertEqual([x.classrooms_count for x in students], [2, 1, 0])
+
+        # Aggregates with filters can't be computed in Python, so they fall back to one query per object.
+        with self.assertNumQueries(3):
+            self.assertEqual([x.failed_classrooms_count for x in students], [1, 0, 0])
+
+    def test_function_ignores_filtered_prefetch(self):
+        # Prefetched objects aren't all the related ones, so they can't be aggregated in Python
+        prefetch = models.Prefetch('studentclassroom_set', queryset=StudentClassroom.objects.filter(grade__gte=7))
+        students = list(Student.objects.prefetch_related(prefetch).order_by('id'))
+        with self.assertNumQueries(3):
+            self.assertEqual([x.average_grade for x in students], [6.5, 9, None])
+
+        prefetch = models.Prefetch('studentclassroom_set', queryset=StudentClassroom.objects.order_by('-grade'))
+        students = list(Student.objects.prefetch_related(prefetch).order_by('id'))
+        with self.assertNumQueries(0):
+            self.assertEqual([x.average_grade for x in students], [6.5, 9, None])
+
+    def test_function_without_prefetch(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.student1.average_grade, 6.5)
+
+    def test_filter(self):
+        qs = Student.objects.filter(Student.average_grade >= 7)
+        self.assertEqual(list(qs), [self.student2])
+
+        qs = Student.objects.filter(Student.classrooms_count == 0)
+        self.assertEqual(list(qs), [self.student3])
+
+        qs = Student.objects.filter(Student.failed_classrooms_count > 0)
+        self.assertEqual(list(qs), [self.student1])
+
+    def test_filter_does_not_group_outer_query(self):
+        qs = Student.objects.filter(Student.average_grade >= 7, StudentClassroom.passed.t('studentclassroom') == True)  # noqa: E712
+        self.assertEqual(list(qs), [self.student2])
+        self.assertNotIn('GROUP BY "tests_student"', str(qs.query))
+
+    def test_through(self):
+        qs = StudentClassroom.objects.filter(Student.average_grade.t('student') < 7)
+        self.assertEqual(qs.count(), 2)
+        self.assertEqual({x.student for x in qs}, {self.student1})
+
+    def test_metadata(self):
+        self.assertEqual(Student.average_grade.name, 'average_grade')
+        self.assertEqual(Student.average_grade.model, Student)
@@ -0,0 +1,85 @@
+from unittest import mock, skipUnless
+
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from django_hybrid_attributes.test_utils import HybridTestCaseMixin, aassert_hybrid_attributes_are_consistent
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:  # asgiref is only a dependency of Django 3.0+
+    async_to_sync = None
+
+
+@skipUnless(async_to_sync, 'asgiref is not installed')
+class AsyncTestCase(HybridTestCaseMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom = Classroom.objects.create(name='IT stuff', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student_classroom = StudentClassroom.objects.create(student=self.student1, classroom=self.classroom, grade=5)
+
+    def test_aget(self):
+        @async_to_sync
+        async def run():
+            self.assertEqual(await Student.objects.aget(Student.full_name == 'Filipe Waitman'), self.student1)
+            self.assertEqual(await Student.objects.filter(first_name='Agent').aget(Student.magic_number_sum > 3), self.student2)
+            self.assertEqual(await Teacher.objects.aget(Teacher.full_name.i() == 'teacher first'), self.teacher)
+            with self.assertRaises(Student.DoesNotExist):
+                await Student.objects.aget(Student.full_name == 'Nobody')
+        run()
+
+    def test_acount_and_aexists(self):
+        @async_to_sync
+        async def run():
+            self.assertEqual(await Student.objects.acount(), 2)
+            self.assertEqual(await Student.objects.acount(Student.get_status() == 'failed'), 1)
+            self.assertTrue(await Student.objects.aexists(Student.magic_number_sum >= 7))
+            self.assertFalse(await Student.objects.aexists(Student.magic_number_sum > 7))
+            self.assertTrue(await StudentClassroom.objects.aexists(StudentClassroom.passed == False))  # noqa: E712
+        run()
+
+    def test_async_for(self):
+        @async_to_sync
+        async def run():
+            return [x async for x in Student.objects.filter(Student.magic_number_sum > 1).order_by('id')]
+        self.assertEqual(run(), [self.student1, self.student2])
+
+    def test_async_for_streams_in_chunks(self):
+        queryset = Student.objects.filter(Student.magic_number_sum > 1).order_by('id')
+        with mock.patch('django_hybrid_attributes.managers.ASYNC_CHUNK_SIZE', 1):
+            @async_to_sync
+            async def run():
+                return [x async for x in queryset]
+            self.assertEqual(run(), [self.student1, self.student2])
+        if not hasattr(QuerySet, '__aiter__'):  # Django 4.1+ iterates (fetching everything) natively
+            self.assertIsNone(queryset._result_cache)
+
+    def test_async_for_cached_and_prefetched(self):
+        @async_to_sync
+        async def run(queryset):
+            return [(x, len(x.studentclassroom_set.all())) async for x in queryset]
+
+        queryset = Student.objects.order_by('id').prefetch_related('studentclassroom_set')
+        self.assertEqual(run(queryset), [(self.student1, 1), (self.student2, 0)])
+        with self.assertNumQueries(0):
+            self.assertEqual(run(queryset), [(self.student1, 1), (self.student2, 0)])
+
+    def test_aassert_hybrid_attributes_are_consistent(self):
+        @async_to_sync
+        async def run():
+            await self.aassertHybridAttributesAreConsistent(Student.full_name)
+            await self.aassertHybridAttributesAreConsistent(Student.get_status, chunk_size=1)
+            await self.aassertHybridAttributesAreConsistent(Student.magic_number1_times_n, 3)
+            await aassert_hybrid_attributes_are_consistent(Student.magic_number1_times_n, n=3, queryset=Student.objects.all())
+
+            with self.assertRaises(AssertionError):
+                await self.aassertHybridAttributesAreConsistent(Student.WRONG_full_name, chunk_size=1)
+            with self.assertRaises(AssertionError):
+                await aassert_hybrid_attributes_are_consistent(Student.WRONG_magic_number1_times_n, n=3)
+            await aassert_hybrid_attributes_are_consistent(Student.WRONG_full_name, queryset=Student.objects.none())
+        run()
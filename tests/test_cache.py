@@ -0,0 +1,120 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.test import TestCase
+
+from django_hybrid_attributes import HybridQuerySet
+from django_hybrid_attributes.cache import _version_key, get_cache_key
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class CachedTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom1 = Classroom.objects.create(name='Boring stuff', teacher=self.teacher)
+        self.classroom2 = Classroom.objects.create(name='IT and software development', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student_classroom = StudentClassroom.objects.create(student=self.student1, classroom=self.classroom1, grade=5)
+
+    def test_cached(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Classroom.objects.filter(Classroom.is_about_technology == True).cached()), [self.classroom2])  # noqa
+        with self.assertNumQueries(0):
+            self.assertEqual(list(Classroom.objects.filter(Classroom.is_about_technology == True).cached()), [self.classroom2])  # noqa
+            self.assertEqual(list(Classroom.objects.cached().filter(Classroom.is_about_technology == True)), [self.classroom2])  # noqa
+
+    def test_not_cached_by_default(self):
+        list(Classroom.objects.filter(Classroom.is_about_technology == True))  # noqa: E712
+        with self.assertNumQueries(1):
+            list(Classroom.objects.filter(Classroom.is_about_technology == True))  # noqa: E712
+
+    def test_key_depends_on_signature(self):
+        def key(queryset):
+            return get_cache_key(queryset)
+
+        base_key = key(Student.objects.filter(Student.full_name == 'a'))
+        self.assertEqual(base_key, key(Student.objects.filter(Student.full_name == 'a')))
+        self.assertNotEqual(base_key, key(Student.objects.filter(Student.full_name == 'b')))
+        self.assertNotEqual(base_key, key(Student.objects.filter(Student.full_name >= 'a')))
+        self.assertNotEqual(base_key, key(Student.objects.filter(Student.full_name.i() == 'a')))
+        self.assertNotEqual(base_key, key(Student.objects.values().filter(Student.full_name == 'a')))
+        self.assertNotEqual(
+            key(Student.objects.filter(Student.magic_number1_times_n(2) == 2)),
+            key(Student.objects.filter(Student.magic_number1_times_n(3) == 2)),
+        )
+        self.assertNotEqual(
+            key(StudentClassroom.objects.filter(Student.full_name.t('student') == 'a')),
+            key(StudentClassroom.objects.filter(Student.full_name.t('student') == 'a', grade=1)),
+        )
+
+    def test_invalidation_on_save_and_delete(self):
+        def get_failed():
+            return list(Student.objects.filter(Student.get_status() == 'failed').cached(timeout=60))
+
+        self.assertEqual(get_failed(), [self.student1])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_failed(), [self.student1])
+
+        # get_status depends on StudentClassroom through a subquery.
+        self.student_classroom.grade = 10
+        self.student_classroom.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_failed(), [])
+
+        StudentClassroom.objects.create(student=self.student2, classroom=self.classroom1, grade=1)
+        self.assertEqual(get_failed(), [self.student2])
+
+        self.student2.delete()
+        self.assertEqual(get_failed(), [])
+
+    def test_invalidation_ignores_unrelated_models(self):
+        list(Student.objects.filter(Student.full_name == 'Filipe Waitman').cached())
+        Teacher.objects.create(first_name='Another', last_name='Teacher')
+        with self.assertNumQueries(0):
+            list(Student.objects.filter(Student.full_name == 'Filipe Waitman').cached())
+
+    def test_invalidation_on_m2m_changes(self):
+        user = User.objects.create(username='filipe')
+        group = Group.objects.create(name='Admins')
+
+        def get_admins():
+            return list(HybridQuerySet(User).filter(groups__name='Admins').cached())
+
+        self.assertEqual(get_admins(), [])
+        user.groups.add(group)
+        self.assertEqual(get_admins(), [user])
+        user.groups.remove(group)
+        self.assertEqual(get_admins(), [])
+        user.groups.add(group)
+        self.assertEqual(get_admins(), [user])
+        user.groups.clear()
+        self.assertEqual(get_admins(), [])
+
+    def test_invalidation_without_cached_querysets_evaluated(self):
+        # Versions are shared through the cache, so processes which never evaluated a cached queryset invalidate it too
+        cache = caches['default']
+        cache.set(_version_key(Student), 'version in another process', None)
+        self.student1.save()
+        self.assertIsNone(cache.get(_version_key(Student)))
+
+    def test_versions_are_only_created_when_used(self):
+        cache = caches['default']
+        list(Student.objects.filter(Student.full_name == 'Filipe Waitman').cached())
+        version = cache.get(_version_key(Student))
+        Teacher.objects.create(first_name='Another', last_name='Teacher')
+        self.student1.save()
+
+        self.assertIsNone(cache.get(_version_key(Teacher)))
+        self.assertIsNone(cache.get(_version_key(Student)))
+        list(Student.objects.filter(Student.full_name == 'Filipe Waitman').cached())
+        self.assertNotIn(cache.get(_version_key(Student)), (None, version))
+
+    def test_empty_queryset(self):
+        self.assertEqual(list(Student.objects.none().cached()), [])
+        self.assertEqual(list(Student.objects.filter(id__in=[]).cached()), [])
+
+    def test_manager(self):
+        self.assertEqual(list(StudentClassroom.objects.cached().filter(StudentClassroom.passed == False)), [self.student_classroom])  # noqa
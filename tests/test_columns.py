@@ -0,0 +1,90 @@
+import array
+import math
+from unittest import mock, skipUnless
+
+from django.db import connection, models
+from django.db.models.sql.compiler import SQLCompiler
+from django.test import TestCase
+
+from django_hybrid_attributes.columns import numpy
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class ToColumnsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        classroom = Classroom.objects.create(name='Boring stuff', teacher=teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student3 = Student.objects.create(magic_number1=5, magic_number2=6, first_name='John', last_name='Doe')
+        StudentClassroom.objects.create(student=self.student1, classroom=classroom, grade=5)
+        StudentClassroom.objects.create(student=self.student2, classroom=classroom, grade=9)
+
+    def test_typed_arrays(self):
+        columns = Student.objects.order_by('pk').to_columns(
+            'pk', Student.magic_number_sum, Student.magic_number1_times_n(2).a('double'), Student.full_name, chunk_size=2,
+        )
+        self.assertEqual(list(columns), ['pk', 'magic_number_sum', 'double', 'full_name'])
+        self.assertEqual(columns['pk'], array.array('q', [self.student1.pk, self.student2.pk, self.student3.pk]))
+        self.assertEqual(columns['magic_number_sum'], array.array('q', [3, 7, 11]))
+        self.assertEqual(columns['double'], array.array('q', [2, 6, 10]))
+        self.assertEqual(columns['full_name'], ['Filipe Waitman', 'Agent Smith', 'John Doe'])
+
+    def test_hybrids_before_fields(self):
+        columns = Student.objects.order_by('pk').to_columns(Student.magic_number_sum, 'pk', Student.full_name, 'first_name')
+        self.assertEqual(list(columns), ['magic_number_sum', 'pk', 'full_name', 'first_name'])
+        self.assertEqual(columns['magic_number_sum'], array.array('q', [3, 7, 11]))
+        self.assertEqual(columns['pk'], array.array('q', [self.student1.pk, self.student2.pk, self.student3.pk]))
+        self.assertEqual(columns['full_name'], ['Filipe Waitman', 'Agent Smith', 'John Doe'])
+        self.assertEqual(columns['first_name'], ['Filipe', 'Agent', 'John'])
+
+    def test_server_side_cursors_can_be_disabled(self):
+        execute_sql = SQLCompiler.execute_sql
+        with mock.patch.object(SQLCompiler, 'execute_sql', autospec=True, side_effect=execute_sql) as mocked:
+            with mock.patch.dict(connection.settings_dict, {'DISABLE_SERVER_SIDE_CURSORS': True}):
+                columns = Student.objects.order_by('pk').to_columns(Student.magic_number_sum)
+        self.assertEqual(columns['magic_number_sum'], array.array('q', [3, 7, 11]))
+        self.assertFalse(mocked.call_args_list[-1][1]['chunked_fetch'])
+
+    def test_float_and_boolean_arrays(self):
+        columns = StudentClassroom.objects.order_by('grade').to_columns(
+            'student', StudentClassroom.get_grade_as_percent(), StudentClassroom.passed,
+        )
+        self.assertEqual(columns['student'], array.array('q', [self.student1.pk, self.student2.pk]))
+        self.assertEqual(columns['get_grade_as_percent'], array.array('d', [0.5, 0.9]))
+        self.assertEqual(columns['passed'], array.array('b', [False, True]))
+
+    def test_null_values(self):
+        columns = Student.objects.order_by('pk').to_columns(Student.average_grade)
+        self.assertEqual(columns['average_grade'][:2], array.array('d', [5.0, 9.0]))
+        self.assertTrue(math.isnan(columns['average_grade'][2]))
+
+        qs = Student.objects.annotate(nothing=models.Value(None, output_field=models.IntegerField()))
+        with self.assertRaises(ValueError):
+            qs.to_columns('nothing')
+
+    def test_filtered_and_empty_querysets(self):
+        columns = Student.objects.filter(Student.magic_number_sum > 5).order_by('pk').to_columns(Student.magic_number_sum)
+        self.assertEqual(columns['magic_number_sum'], array.array('q', [7, 11]))
+
+        columns = Student.objects.none().to_columns(Student.magic_number_sum)
+        self.assertEqual(columns['magic_number_sum'], array.array('q'))
+
+    def test_queries(self):
+        with self.assertNumQueries(2):  # count + select
+            Student.objects.to_columns(Student.magic_number_sum, Student.full_name, chunk_size=1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Student.objects.to_columns(Student.magic_number_sum, backend='pandas')
+        with self.assertRaises(ValueError):
+            Student.objects.to_columns(Student.magic_number1_times_n(1), Student.magic_number1_times_n(2))
+
+    @skipUnless(numpy, 'NumPy is not installed')
+    def test_numpy_backend(self):
+        columns = Student.objects.order_by('pk').to_columns(Student.magic_number_sum, Student.full_name, backend='numpy')
+        self.assertEqual(columns['magic_number_sum'].dtype, numpy.int64)
+        self.assertEqual(columns['magic_number_sum'].tolist(), [3, 7, 11])
+        self.assertEqual(columns['full_name'].tolist(), ['Filipe Waitman', 'Agent Smith', 'John Doe'])
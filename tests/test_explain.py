@@ -0,0 +1,69 @@
+from django.db import models
+from django.test import TestCase
+
+from django_hybrid_attributes.explain import FLAG_DISTINCT_SORT, FLAG_FULL_SCAN, FLAG_REPEATED_SUBPLAN, HybridExplanation
+
+from .models import Student, StudentClassroom
+
+
+class ExplainTestCase(TestCase):
+    def test_explain_hybrids(self):
+        qs = Student.objects.filter(Student.full_name == 'Filipe Waitman', first_name='Filipe')
+        explanation = qs.explain_hybrids()
+
+        self.assertIsInstance(explanation, HybridExplanation)
+        self.assertEqual(list(explanation.hybrids), ['Student.full_name'])
+        self.assertIn('"tests_student"."first_name"', explanation.hybrid_sql['Student.full_name'])
+
+        # Filtering over a concatenation can't use any index. The hybrid only reads the base table, so it isn't
+        # attributed the scan (every hybrid of the model would be).
+        self.assertTrue(explanation.full_scans)
+        self.assertEqual(explanation.full_scans[0].hybrids, ())
+        self.assertEqual(explanation.hybrids['Student.full_name'], [])
+        self.assertIn('FULL_SCAN', str(explanation))
+
+    def test_explain_hybrids_attribution(self):
+        qs = Student.objects.filter(Student.full_name == 'Filipe Waitman').with_hybrids(Student.get_status())
+        explanation = qs.explain_hybrids()
+
+        self.assertEqual(set(explanation.hybrids), {'Student.full_name', 'Student.get_status'})
+        self.assertEqual(explanation.hybrids['Student.full_name'], [])
+        self.assertTrue(explanation.hybrids['Student.get_status'])
+        self.assertTrue(all(x.hybrids == ('Student.get_status',) for x in explanation.hybrids['Student.get_status']))
+
+    def test_explain_hybrids_flags(self):
+        qs = Student.objects.filter(
+            Student.get_status() == 'failed',
+            StudentClassroom.passed.t('studentclassroom') == True,  # noqa: E712
+        ).distinct()
+        explanation = qs.explain_hybrids()
+
+        self.assertEqual(set(explanation.hybrids), {'Student.get_status', 'StudentClassroom.passed'})
+        self.assertTrue(explanation.distinct_sorts)
+        self.assertEqual(explanation.distinct_sorts[0].flags, {FLAG_DISTINCT_SORT})
+        self.assertTrue(explanation.hybrids['Student.get_status'])
+
+        # The join on studentclassroom uses the FK index.
+        passed_nodes = [x for x in explanation.hybrids['StudentClassroom.passed'] if 'tests_studentclassroom' in x.detail]
+        self.assertTrue(passed_nodes)
+        self.assertTrue(any(FLAG_FULL_SCAN not in x.flags for x in passed_nodes))
+
+    def test_explain_hybrids_repeated_subplans(self):
+        qs = Student.objects.filter(StudentClassroom.passed.t('studentclassroom') == True)  # noqa: E712
+        qs = qs.annotate(grade=models.Subquery(StudentClassroom.objects.filter(student=models.OuterRef('pk')).values('grade')[:1]))
+        explanation = qs.explain_hybrids()
+        self.assertEqual(len(explanation.repeated_subplans), 1)
+        self.assertEqual(explanation.repeated_subplans[0].flags, {FLAG_REPEATED_SUBPLAN})
+
+    def test_explain_without_hybrids(self):
+        explanation = Student.objects.filter(first_name='Filipe').explain_hybrids()
+        self.assertEqual(explanation.hybrids, {})
+        self.assertTrue(all(not x.hybrids for x in explanation.nodes))
+
+    def test_hybrid_expression_result_explain(self):
+        explanation = (Student.magic_number_sum > 3).explain(Student.objects.all())
+        self.assertEqual(list(explanation.hybrids), ['Student.magic_number_sum'])
+        self.assertTrue(explanation.full_scans)
+
+        explanation = (Student.full_name == Student.full_name_lowercased).explain(Student.objects.all())
+        self.assertEqual(set(explanation.hybrids), {'Student.full_name', 'Student.full_name_lowercased'})
@@ -0,0 +1,93 @@
+import inspect
+
+from django.test import TestCase
+
+from django_hybrid_attributes.instrumentation import InMemoryCollector
+from django_hybrid_attributes.signals import hybrid_attribute_accessed, hybrid_filter_applied
+from django_hybrid_attributes.test_utils import assert_hybrid_attributes_are_consistent
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class InstrumentationTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom = Classroom.objects.create(name='IT stuff', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom, grade=5)
+
+    def test_filter_applied_signal(self):
+        received = []
+
+        def receiver(**kwargs):
+            received.append(kwargs)
+
+        hybrid_filter_applied.connect(receiver)
+        self.addCleanup(hybrid_filter_applied.disconnect, receiver)
+
+        qs = StudentClassroom.objects.filter(Student.full_name.a('_name').t('student') == 'Filipe Waitman')
+        self.assertEqual(qs.count(), 1)
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['sender'], Student)
+        self.assertEqual(received[0]['hybrid'], 'full_name')
+        self.assertEqual(received[0]['alias'], '_name')
+        self.assertIn('"tests_student"."first_name"', received[0]['sql'])
+        self.assertGreaterEqual(received[0]['build_time'], 0)
+        self.assertGreaterEqual(received[0]['apply_time'], 0)
+
+    def test_attribute_accessed_signal(self):
+        received = []
+
+        def receiver(**kwargs):
+            received.append(kwargs)
+
+        hybrid_attribute_accessed.connect(receiver)
+        self.addCleanup(hybrid_attribute_accessed.disconnect, receiver)
+
+        self.assertEqual(self.student1.full_name, 'Filipe Waitman')
+        self.assertEqual(self.student1.get_status(), 'failed')
+        self.assertEqual(self.student1.magic_number1_times_n.__name__, 'magic_number1_times_n')
+
+        self.assertEqual([x['hybrid'] for x in received], ['full_name', 'get_status'])
+        self.assertEqual([x['queries'] for x in received], [0, 1])
+        self.assertEqual(received[0]['instance'], self.student1)
+
+    def test_no_signal_when_no_receivers(self):
+        self.assertFalse(hybrid_attribute_accessed.receivers)
+        self.assertEqual(self.student1.magic_number1_times_n, self.student1.magic_number1_times_n)
+
+    def test_in_memory_collector(self):
+        with InMemoryCollector() as collector:
+            list(Student.objects.filter(Student.full_name == 'Filipe Waitman'))
+            list(Student.objects.filter(Student.full_name != 'Filipe Waitman'))
+            list(Student.objects.filter(Student.magic_number_sum > 1))
+            [student.get_status() for student in Student.objects.all()]
+
+        # Uninstalled collectors do not collect anything else.
+        list(Student.objects.filter(Student.full_name == 'Filipe Waitman'))
+
+        stats = {x.hybrid: x for x in collector.top(10)}
+        self.assertEqual(set(stats), {'full_name', 'magic_number_sum', 'get_status'})
+        self.assertEqual(stats['full_name'].filter_count, 2)
+        self.assertEqual(stats['magic_number_sum'].filter_count, 1)
+        self.assertEqual(stats['get_status'].access_count, 2)
+        self.assertEqual(stats['get_status'].access_queries, 2)
+
+        self.assertEqual([x.hybrid for x in collector.top(1, key='calls')], ['full_name'])
+        self.assertEqual([x.hybrid for x in collector.top(1, key='access_queries')], ['get_status'])
+
+        report = collector.dump(10)
+        self.assertIn('tests.Student.full_name: calls=2', report)
+        self.assertIn('SQL: ', report)
+
+        collector.reset()
+        self.assertEqual(collector.top(), [])
+
+    def test_instrumented_hybrid_methods_are_still_methods(self):
+        with InMemoryCollector():
+            self.assertTrue(inspect.ismethod(self.student1.get_status))
+            self.assertEqual(self.student1.get_status.__name__, 'get_status')
+            assert_hybrid_attributes_are_consistent(Student.magic_number1_times_n, n=3)
@@ -0,0 +1,36 @@
+from unittest import mock
+
+from django.db import models
+from django.test import TestCase
+
+from django_hybrid_attributes import HybridExpression
+
+from .models import Student
+
+
+class LazyExpressionTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        patcher = mock.patch.object(HybridExpression, 'expression', autospec=True, side_effect=HybridExpression.expression)
+        self.expression = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_comparisons_are_not_built_until_applied(self):
+        comparison = Student.get_status() == 'failed'
+        combined = ~comparison | (Student.full_name_lowercased == 'filipe waitman') & models.Q(magic_number1=1)
+        self.assertEqual(self.expression.call_count, 0)
+        self.assertEqual(comparison.build_time, 0)
+
+        self.assertEqual(list(Student.objects.filter(combined)), [self.student])
+        self.assertEqual(self.expression.call_count, 2)
+
+    def test_expressions_are_built_once(self):
+        comparison = Student.magic_number_sum < Student.magic_number1_times_n(10)
+        self.assertEqual(self.expression.call_count, 0)
+
+        self.assertEqual(list(Student.objects.filter(comparison)), [self.student])
+        self.assertEqual(list(Student.objects.exclude(comparison)), [])
+        self.assertEqual(self.expression.call_count, 2)
+        self.assertGreater(comparison.build_time, 0)
+        self.assertEqual(repr(comparison.expr), repr(Student.magic_number_sum.expression()))
@@ -0,0 +1,129 @@
+from django.test import TestCase
+
+from django_hybrid_attributes import HybridPrefetch
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class HybridPrefetchTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom1 = Classroom.objects.create(name='Boring stuff', teacher=self.teacher)
+        self.classroom2 = Classroom.objects.create(name='IT and software development', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom1, grade=5)
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom2, grade=7)
+        StudentClassroom.objects.create(student=self.student2, classroom=self.classroom1, grade=9)
+
+    def test_prefetch(self):
+        qs = Student.objects.order_by('id').prefetch_related(
+            HybridPrefetch('studentclassroom_set', hybrids=[StudentClassroom.passed, StudentClassroom.get_grade_as_percent])
+        )
+        with self.assertNumQueries(2):
+            students = list(qs)
+
+        children = [list(x.studentclassroom_set.all()) for x in students]
+        with self.assertNumQueries(0):
+            self.assertEqual([[y.passed for y in x] for x in children], [[False, True], [True]])
+            self.assertEqual([[y.get_grade_as_percent() for y in x] for x in children], [[0.5, 0.7], [0.9]])
+
+        # Values were indeed computed in SQL.
+        self.assertEqual(sorted(children[0][0]._hybrid_values.values()), [False, 0.5])
+
+    def test_prefetch_nested_with_queries_per_object(self):
+        qs = Classroom.objects.order_by('id').prefetch_related(
+            HybridPrefetch('studentclassroom_set__student', hybrids=[Student.get_status, Student.full_name]),
+        )
+        with self.assertNumQueries(3):
+            classrooms = list(qs)
+
+        with self.assertNumQueries(0):
+            result = [
+                sorted((x.student.full_name, x.student.get_status()) for x in classroom.studentclassroom_set.all())
+                for classroom in classrooms
+            ]
+        self.assertEqual(result, [
+            [('Agent Smith', 'passed'), ('Filipe Waitman', 'failed')],
+            [('Filipe Waitman', 'failed')],
+        ])
+
+    def test_prefetch_custom_queryset_and_to_attr(self):
+        qs = Student.objects.order_by('id').prefetch_related(
+            HybridPrefetch(
+                'studentclassroom_set',
+                queryset=StudentClassroom.objects.filter(grade__gte=7),
+                to_attr='good_classrooms',
+                hybrids=[StudentClassroom.passed],
+            )
+        )
+        students = list(qs)
+        with self.assertNumQueries(0):
+            self.assertEqual([[y.passed for y in x.good_classrooms] for x in students], [[True], [True]])
+
+    def test_prefetch_without_hybrids(self):
+        qs = Student.objects.prefetch_related(HybridPrefetch('studentclassroom_set'))
+        self.assertEqual(sorted(len(x.studentclassroom_set.all()) for x in qs), [1, 2])
+
+    def test_with_hybrids(self):
+        qs = Student.objects.order_by('id').with_hybrids(Student.get_status, Student.magic_number1_times_n(3))
+        with self.assertNumQueries(1):
+            students = list(qs)
+            self.assertEqual([x.get_status() for x in students], ['failed', 'passed'])
+            self.assertEqual([x.magic_number1_times_n(3) for x in students], [3, 9])
+
+        # Arguments not precomputed fall back to Python.
+        self.assertEqual([x.magic_number1_times_n(4) for x in students], [4, 12])
+
+    def test_with_hybrids_preserves_descriptors(self):
+        student = Student.objects.with_hybrids(Student.full_name).get(id=self.student1.id)
+        self.assertEqual(student.full_name, 'Filipe Waitman')
+
+        # Setting through the descriptor discards precomputed values.
+        student.full_name = 'Someone Else'
+        self.assertEqual(student.full_name, 'Someone Else')
+
+    def test_with_hybrids_discarded_when_fields_change(self):
+        student = Student.objects.with_hybrids(Student.full_name).get(id=self.student1.id)
+        student.first_name = 'Zed'
+        self.assertEqual(student.full_name, 'Zed Waitman')
+        self.assertNotIn('_hybrid_values', student.__dict__)
+
+        student = Student.objects.with_hybrids(Student.full_name).get(id=self.student1.id)
+        Student.objects.filter(id=self.student1.id).update(last_name='Smith')
+        self.assertEqual(student.full_name, 'Filipe Waitman')  # Still the values it was loaded with
+        student.refresh_from_db()
+        self.assertEqual(student.full_name, 'Filipe Smith')
+
+        # Saving unchanged fields keeps them.
+        student = Student.objects.with_hybrids(Student.full_name).get(id=self.student1.id)
+        student.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(student.full_name, 'Filipe Smith')
+        self.assertIn('_hybrid_values', student.__dict__)
+
+    def test_with_hybrids_discarded_on_refresh_from_db(self):
+        student = Student.objects.with_hybrids(Student.get_status).get(id=self.student1.id)
+        StudentClassroom.objects.filter(student=self.student1).update(grade=10)
+        self.assertEqual(student.get_status(), 'failed')
+        student.refresh_from_db()
+        self.assertEqual(student.get_status(), 'passed')
+
+        # Partial refreshes (as when loading deferred fields) keep them.
+        student = Student.objects.with_hybrids(Student.get_status).only('id').get(id=self.student1.id)
+        self.assertEqual(student.first_name, 'Filipe')
+        with self.assertNumQueries(0):
+            self.assertEqual(student.get_status(), 'passed')
+
+    def test_with_hybrids_from_manager(self):
+        student_classroom = StudentClassroom.objects.with_hybrids(StudentClassroom.passed).filter(grade=9).get()
+        self.assertEqual(student_classroom._hybrid_values, {'_hybrid_value__passed': True})
+        self.assertEqual(student_classroom.passed, True)
+
+    def test_hybrids_must_belong_to_model(self):
+        with self.assertRaises(AssertionError):
+            Student.objects.with_hybrids(StudentClassroom.passed)
+
+        with self.assertRaises(AssertionError):
+            Student.objects.with_hybrids(Student.full_name.t('studentclassroom__student'))
@@ -0,0 +1,122 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import models
+from django.test import TransactionTestCase
+
+from django_hybrid_attributes import HybridProjection
+from django_hybrid_attributes.test_utils import aassert_hybrid_attributes_are_consistent, assert_hybrid_attributes_are_consistent
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:  # asgiref is only a dependency of Django 3.0+
+    async_to_sync = None
+
+
+class HybridProjectionTestCase(TransactionTestCase):  # SQLite can't create tables inside transactions
+    def setUp(self):
+        super().setUp()
+        self.projection = HybridProjection(
+            Student, [Student.get_status, Student.average_grade, Student.magic_number1_times_n(2)], name='student_summary',
+        )
+        self.addCleanup(self.projection.unregister)
+        self.addCleanup(self.projection.drop_table)
+
+        teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom = Classroom.objects.create(name='Boring stuff', teacher=teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom, grade=5)
+        StudentClassroom.objects.create(student=self.student2, classroom=self.classroom, grade=9)
+
+    def test_columns(self):
+        self.assertEqual(list(self.projection.columns)[:2], ['get_status', 'average_grade'])
+        self.assertTrue(list(self.projection.columns)[2].startswith('magic_number1_times_n_'))
+
+        # Averages of integers are stored as floats (older Django versions report subqueries as their first column)
+        self.assertIsInstance(self.projection.model._meta.get_field('get_status'), models.TextField)
+        self.assertIsInstance(self.projection.model._meta.get_field('average_grade'), models.FloatField)
+
+    def test_comparisons_read_from_the_projection(self):
+        self.assertEqual(self.projection.refresh(), 2)
+
+        qs = Student.objects.filter(Student.get_status() == 'passed')
+        self.assertIn('student_hybrids', str(qs.query))
+        self.assertNotIn('tests_studentclassroom', str(qs.query))
+        self.assertEqual(list(qs), [self.student2])
+        self.assertEqual(list(Student.objects.filter(Student.average_grade > 6)), [self.student2])
+        self.assertEqual(list(Student.objects.filter(Student.magic_number1_times_n(2) == 6)), [self.student2])
+
+        # Not projected (arguments differ), so computed from the hybrid definition
+        self.assertEqual(list(Student.objects.filter(Student.magic_number1_times_n(3) == 9)), [self.student2])
+        self.assertPrecomputedStatusIsConsistent()
+
+    def assertPrecomputedStatusIsConsistent(self):
+        for student in Student.objects.with_hybrids(Student.get_status, Student.average_grade):
+            self.assertEqual(student.__dict__['_hybrid_values']['_hybrid_value__get_status'], student.get_status())
+
+    def test_hybrids_are_computed_until_the_table_exists(self):
+        self.assertFalse(self.projection.table_exists())
+        qs = Student.objects.filter(Student.get_status() == 'passed')
+        self.assertNotIn('student_hybrids', str(qs.query))
+        self.assertEqual(list(qs), [self.student2])
+        self.assertPrecomputedStatusIsConsistent()
+
+        with self.assertNumQueries(1):  # Missing tables aren't looked up again right away
+            self.assertEqual(list(Student.objects.filter(Student.average_grade > 6)), [self.student2])
+
+        self.projection.refresh()
+        self.assertTrue(self.projection.table_exists())
+        self.assertIn('student_hybrids', str(Student.objects.filter(Student.get_status() == 'passed').query))
+
+    def test_consistency_helpers_ignore_the_projection(self):
+        self.projection.refresh()
+        StudentClassroom.objects.filter(student=self.student1).update(grade=10)
+        assert_hybrid_attributes_are_consistent(Student.get_status)
+        assert_hybrid_attributes_are_consistent(Student.average_grade)
+
+    @skipUnless(async_to_sync, 'asgiref is not installed')
+    def test_async_consistency_helpers_ignore_the_projection(self):
+        self.projection.refresh()
+        StudentClassroom.objects.filter(student=self.student1).update(grade=10)
+        async_to_sync(aassert_hybrid_attributes_are_consistent)(Student.get_status)
+
+    def test_projection_is_stale_until_refreshed(self):
+        self.projection.refresh()
+        StudentClassroom.objects.create(student=self.student1, classroom=self.classroom, grade=10)
+        Student.objects.create(magic_number1=5, magic_number2=6, first_name='John', last_name='Doe')
+
+        self.assertEqual(list(Student.objects.filter(Student.average_grade > 6)), [self.student2])
+        self.assertEqual(len(Student.objects.filter(Student.average_grade.live() > 6)), 2)
+
+        self.assertEqual(self.projection.refresh(incremental=True), 2)  # One new row, one changed row
+        self.assertEqual(len(Student.objects.filter(Student.average_grade > 6)), 2)
+        self.assertEqual(self.projection.refresh(incremental=True), 0)
+
+    def test_incremental_refresh_deletes_rows(self):
+        self.projection.refresh()
+        self.student1.delete()
+        self.assertEqual(self.projection.refresh(incremental=True), 1)
+        self.assertEqual(list(self.projection.model.objects.values_list('pk', flat=True)), [self.student2.pk])
+
+    def test_refresh_hybrid_views_command(self):
+        out = StringIO()
+        call_command('refresh_hybrid_views', 'student_summary', stdout=out)
+        self.assertEqual(out.getvalue(), 'student_summary: 2 row(s) written\n')
+
+        call_command('refresh_hybrid_views', '--incremental', stdout=out)
+        self.assertIn('student_summary: 0 row(s) written\n', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('refresh_hybrid_views', 'unknown')
+
+    def test_invalid_declarations(self):
+        with self.assertRaises(AssertionError):
+            HybridProjection(Student, [Student.get_status], name='other_summary')
+        with self.assertRaises(AssertionError):
+            HybridProjection(Student, [Student.full_name.t('student')], name='other_summary')
+        with self.assertRaises(AssertionError):
+            HybridProjection(Student, [Teacher.full_name], name='other_summary')
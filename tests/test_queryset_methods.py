@@ -0,0 +1,147 @@
+from django.db import models
+from django.test import TestCase
+
+from django_hybrid_attributes import HybridManagerMixin, HybridQuerySetMixin
+from django_hybrid_attributes.core import _hybrid_value_alias
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+class StudentQuerySet(models.QuerySet):
+    def lucky(self):
+        return self.filter(magic_number1=1)
+
+
+class StudentManager(HybridManagerMixin, models.Manager.from_queryset(StudentQuerySet)):
+    pass
+
+
+class QuerySetMethodsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student3 = Student.objects.create(magic_number1=5, magic_number2=6, first_name='John', last_name='Doe')
+
+    def test_exclude(self):
+        qs = Student.objects.exclude(Student.magic_number_sum > 5)
+        self.assertEqual(list(qs), [self.student1])
+
+        qs = Student.objects.exclude(Student.full_name == 'Agent Smith', magic_number1=3)
+        self.assertEqual(list(qs), [self.student1, self.student3])
+
+        qs = Student.objects.exclude(~(Student.magic_number_sum > 5))
+        self.assertEqual(list(qs), [self.student2, self.student3])
+
+    def test_get(self):
+        self.assertEqual(Student.objects.get(Student.full_name == 'Agent Smith'), self.student2)
+        self.assertEqual(Student.objects.get(Student.magic_number_sum > 5, magic_number1=5), self.student3)
+        with self.assertRaises(Student.DoesNotExist):
+            Student.objects.get(Student.full_name == 'Nobody')
+
+    def test_combined_q_objects(self):
+        qs = Student.objects.filter(models.Q(magic_number1=1) | (Student.full_name == 'John Doe'))
+        self.assertEqual(list(qs), [self.student1, self.student3])
+
+        qs = Student.objects.filter((Student.magic_number_sum > 5) & ~(Student.full_name_lowercased == 'john doe'))
+        self.assertEqual(list(qs), [self.student2])
+
+        qs = Student.objects.filter(~(Student.magic_number1_times_n(2) == 2))
+        self.assertEqual(list(qs), [self.student2, self.student3])
+
+        qs = Student.objects.filter(models.Q(magic_number1=3) | (Student.magic_number1_times_n(2) < models.F('magic_number2')))
+        self.assertEqual(list(qs), [self.student2])
+
+    def test_combined_q_objects_are_annotated_once(self):
+        qs = Student.objects.filter(models.Q(magic_number1=1) | (Student.full_name == 'John Doe'))
+        self.assertEqual(len(qs.query.annotations), 1)
+        self.assertEqual(len(qs._hybrid_aliases), 1)
+
+    def test_annotate(self):
+        qs = Student.objects.annotate(
+            Student.magic_number_sum,
+            Student.magic_number1_times_n(2).a('_double'),
+            is_smith=(Student.full_name == 'Agent Smith'),
+        ).order_by('pk')
+        self.assertEqual(list(qs.values_list('_double', 'is_smith')), [(2, False), (6, True), (10, False)])
+        self.assertLessEqual({_hybrid_value_alias('magic_number_sum'), '_double'}, set(qs._hybrid_aliases))
+
+        with self.assertNumQueries(1):
+            students = list(qs)
+        self.assertEqual(
+            [(x.magic_number_sum, x._double, x.is_smith) for x in students], [(3, 2, False), (7, 6, True), (11, 10, False)],
+        )
+        self.assertEqual(students[0]._hybrid_values, {_hybrid_value_alias('magic_number_sum'): 3})
+
+    def test_annotate_does_not_shadow_hybrids(self):
+        teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.assertEqual(Teacher.objects.annotate(Teacher.full_name).get().full_name, 'Teacher First')
+        self.assertEqual(Teacher.objects.annotate(Teacher.full_name).get(), teacher)
+
+        student = Student.objects.annotate(Student.magic_number1_times_n(2)).get(pk=self.student2.pk)
+        self.assertEqual(student.magic_number1_times_n(2), 6)
+        self.assertEqual(student.magic_number1_times_n(3), 9)
+
+        classroom = Classroom.objects.create(name='IT', teacher=Teacher.objects.get())
+        self.assertIs(Classroom.objects.annotate(Classroom.is_about_technology).get(pk=classroom.pk).is_about_technology, True)
+
+        student = Student.objects.annotate(Student.full_name).get(pk=self.student1.pk)
+        student.full_name = 'Someone Else'  # The setter is called only when asked to
+        self.assertEqual((student.first_name, student.full_name), ('Someone', 'Someone Else'))
+
+    def test_annotate_duplicated_names(self):
+        with self.assertRaises(ValueError):
+            Student.objects.annotate(Student.magic_number1_times_n(2).a('n'), Student.magic_number1_times_n(3).a('n'))
+        with self.assertRaises(ValueError):
+            Student.objects.annotate(Student.magic_number_sum.a('total'), total=models.F('magic_number1'))
+        with self.assertRaises(ValueError):  # Not read by instances, so an alias is needed
+            StudentClassroom.objects.annotate(Student.full_name.t('student'))
+
+        qs = Student.objects.annotate(Student.magic_number1_times_n(2), Student.magic_number1_times_n(3)).order_by('pk')
+        self.assertEqual([(x.magic_number1_times_n(2), x.magic_number1_times_n(3)) for x in qs], [(2, 3), (6, 9), (10, 15)])
+
+    def test_deconstruct(self):
+        comparison = Student.full_name == 'Agent Smith'
+        path, args, kwargs = comparison.deconstruct()
+        self.assertEqual(path, 'django.db.models.Q')
+        q = models.Q(*args, **kwargs)
+        self.assertEqual(q.children, [(f'{comparison.alias}__exact', 'Agent Smith')])
+
+        path, args, kwargs = (~(Student.full_name == 'Agent Smith') | models.Q(magic_number1=1)).deconstruct()
+        self.assertEqual(len(models.Q(*args, **kwargs).children), 2)
+
+    def test_order_by(self):
+        qs = Student.objects.order_by(Student.full_name)
+        self.assertEqual(list(qs), [self.student2, self.student1, self.student3])
+
+        qs = Student.objects.order_by(Student.magic_number1_times_n(-1), 'pk')
+        self.assertEqual(list(qs), [self.student3, self.student2, self.student1])
+
+    def test_get_or_create(self):
+        student, created = Student.objects.get_or_create(Student.full_name == 'Agent Smith', magic_number1=3)
+        self.assertEqual((student, created), (self.student2, False))
+
+        defaults = {'magic_number2': 8, 'first_name': 'New', 'last_name': 'Student'}
+        student, created = Student.objects.get_or_create(Student.full_name == 'New Student', magic_number1=7, defaults=defaults)
+        self.assertTrue(created)
+        self.assertEqual(student.full_name, 'New Student')
+
+        student, created = Student.objects.get_or_create(defaults, magic_number1=7)
+        self.assertEqual((student.full_name, created), ('New Student', False))
+
+    def test_update_or_create(self):
+        student, created = Student.objects.update_or_create(Student.full_name == 'John Doe', defaults={'magic_number1': 9})
+        self.assertEqual((student, created), (self.student3, False))
+        self.student3.refresh_from_db()
+        self.assertEqual(self.student3.magic_number1, 9)
+
+    def test_manager_preserves_custom_queryset(self):
+        manager = StudentManager()
+        manager.model = Student
+
+        qs = manager.get_queryset()
+        self.assertIsInstance(qs, StudentQuerySet)
+        self.assertIsInstance(qs, HybridQuerySetMixin)
+        self.assertIs(type(qs), type(manager.all()))
+        self.assertEqual(list(manager.filter(Student.magic_number_sum < 10).lucky()), [self.student1])
+        self.assertEqual(list(manager.lucky().filter(Student.magic_number_sum < 10)), [self.student1])
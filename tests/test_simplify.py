@@ -0,0 +1,113 @@
+from unittest import mock, skipUnless
+
+from django.db import models
+from django.db.models import functions
+from django.db.models.functions import Concat, Lower, Upper
+from django.test import TestCase
+
+from django_hybrid_attributes.simplify import simplify
+
+from .models import Student
+
+
+class SimplifyTestCase(TestCase):
+    def test_constant_folding(self):
+        self.assertEqual(simplify(models.Value(2) + models.Value(3)), models.Value(5))
+        self.assertEqual(repr(simplify(models.F('x') * (models.Value(2) * models.Value(3)))), repr(models.F('x') * models.Value(6)))
+        self.assertEqual(simplify(models.Value(1.5) - models.Value(1)), models.Value(0.5))
+
+        not_folded = [
+            models.Value(7) / models.Value(2),  # Integer division semantics depend on the database
+            models.Value(7) % models.Value(2),
+            models.Value('a') + models.Value('b'),
+            models.Value(True) + models.Value(1),
+            (models.F('x') + models.Value(1)) + models.Value(2),
+        ]
+        for expression in not_folded:
+            self.assertIs(simplify(expression), expression)
+
+    def test_constant_folding_keeps_output_field(self):
+        expression = simplify(models.ExpressionWrapper(
+            models.Value(2) * models.Value(3), output_field=models.IntegerField(),
+        ))
+        self.assertEqual(expression.expression.value, 6)
+
+        expression = simplify(models.Value(2, output_field=models.FloatField()) * models.Value(3))
+        self.assertIsInstance(expression.output_field, models.FloatField)
+
+    def test_redundant_wrappers(self):
+        self.assertEqual(repr(simplify(Lower(Lower(Lower('name'))))), repr(Lower('name')))
+        self.assertEqual(
+            repr(simplify(Concat(Lower(Lower('first')), Upper(Upper('last'))))), repr(Concat(Lower('first'), Upper('last'))),
+        )
+        self.assertEqual(repr(simplify(Upper(Lower('name')))), repr(Upper(Lower('name'))))
+
+    @skipUnless(hasattr(functions, 'Abs'), 'Abs() requires Django 2.2 or later')
+    def test_redundant_math_wrappers(self):
+        expression = functions.Abs(models.F('x') - 1)
+        self.assertEqual(repr(simplify(functions.Abs(expression))), repr(expression))
+
+    @skipUnless(hasattr(functions, 'LTrim'), 'Trim functions require Django 2.1 or later')
+    def test_redundant_trim_wrappers(self):
+        self.assertEqual(repr(simplify(functions.LTrim(functions.Trim('name')))), repr(functions.Trim('name')))
+        self.assertEqual(repr(simplify(functions.Trim(functions.LTrim('name')))), repr(functions.Trim('name')))
+
+    def test_redundant_wrappers_without_trim_functions(self):
+        # Django < 2.1 has no Trim/LTrim/RTrim
+        with mock.patch('django_hybrid_attributes.simplify._TRIM_FUNCTIONS', ()):
+            self.assertEqual(repr(simplify(Lower(Lower('name')))), repr(Lower('name')))
+            self.assertEqual(repr(simplify(Upper(Lower('name')))), repr(Upper(Lower('name'))))
+
+    def test_expression_is_not_modified(self):
+        inner = Lower(Lower('name'))
+        expression = Upper(inner)
+        simplify(expression)
+        self.assertIs(expression.get_source_expressions()[0], inner)
+        self.assertEqual(repr(inner.get_source_expressions()[0]), repr(Lower('name')))
+
+    def test_hybrid_expressions_are_simplified(self):
+        self.assertEqual(
+            repr(Student.magic_number1_times_n(models.Value(2) * models.Value(3)).expression()),
+            repr(models.F('magic_number1') * models.Value(6)),
+        )
+
+
+class CommonSubexpressionTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+
+    def test_identical_hybrids_share_an_alias(self):
+        qs = Student.objects.filter(Student.full_name.l('startswith') == 'Agent').filter(
+            Student.full_name == 'Agent Smith',
+            models.Q(magic_number1=1) | (Student.full_name.l('endswith') == 'Smith'),
+        )
+        self.assertEqual(len(qs.query.annotations), 1)
+        select, where = str(qs.query).split(' WHERE ')
+        self.assertEqual(select.count('"tests_student"."last_name"'), 1 + 1)  # The field and a single hybrid column
+        self.assertEqual(where.count('"tests_student"."last_name"'), 3)
+        self.assertEqual(list(qs), [self.student2])
+
+        qs = Student.objects.exclude(Student.full_name == 'Agent Smith').exclude(Student.full_name == 'Filipe Waitman')
+        self.assertEqual(len(qs.query.annotations), 1)
+        self.assertEqual(list(qs), [])
+
+    def test_explicit_aliases_are_kept(self):
+        qs = Student.objects.filter(Student.full_name == 'Agent Smith', Student.full_name.a('_name').l('startswith') == 'A')
+        self.assertEqual(len(qs.query.annotations), 2)
+        self.assertEqual(list(qs.order_by('_name')), [self.student2])
+
+    def test_identical_subtrees_share_the_resolved_expression(self):
+        qs = Student.objects.filter(Student.full_name == 'Agent Smith', Student.full_name_lowercased == 'agent smith')
+        full_name, full_name_lowercased = qs.query.annotations.values()
+        self.assertIs(full_name_lowercased.get_source_expressions()[0], full_name)
+        # Only resolution is saved: SQL can't reference SELECT aliases in WHERE, so the Concat is still inlined everywhere
+        select, where = str(qs.query).split(' WHERE ')
+        self.assertEqual(select.count('"tests_student"."last_name"'), 1 + 2)
+        self.assertEqual(where.count('"tests_student"."last_name"'), 2)
+        self.assertEqual(list(qs), [self.student2])
+
+    def test_aggregates_are_not_reused_inside_other_expressions(self):
+        qs = Student.objects.annotate(total=models.Sum('magic_number1')).filter(Student.magic_number_sum > 0)
+        self.assertEqual(qs.count(), 2)
@@ -1,6 +1,9 @@
 from django.test import TestCase
 
-from django_hybrid_attributes.test_utils import HybridTestCaseMixin, assert_hybrid_attributes_are_consistent
+from django_hybrid_attributes.test_utils import (
+    HybridQueryReport, HybridTestCaseMixin, assert_hybrid_attributes_are_consistent, assert_hybrid_query_budget,
+    find_linear_hybrids, measure_hybrid_queries
+)
 
 from .models import Student
 
@@ -39,3 +42,58 @@ class assertHybridAttributesAreConsistentTestCase(HybridTestCaseMixin, TestCase)
         self.assertHybridAttributesAreConsistent(Student.WRONG_magic_number1_times_n, n=3, queryset=Student.objects.none())
         assert_hybrid_attributes_are_consistent(Student.WRONG_full_name, queryset=Student.objects.none())
         assert_hybrid_attributes_are_consistent(Student.WRONG_magic_number1_times_n, n=3, queryset=Student.objects.none())
+
+
+class assertHybridQueryBudgetTestCase(HybridTestCaseMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+
+    def test_success_cases(self):
+        self.assertHybridQueryBudget(Student.full_name, Student.objects.all())
+        self.assertHybridQueryBudget(Student.magic_number1_times_n, Student.objects.all(), 3)
+        self.assertHybridQueryBudget(Student.magic_number1_times_n, n=3)
+        self.assertHybridQueryBudget(Student.get_status, Student.objects.all(), max_queries=2)
+        assert_hybrid_query_budget(Student.full_name, Student.objects.all())
+        assert_hybrid_query_budget(Student.get_status, queryset=Student.objects.all(), max_queries=2)
+
+    def test_error_cases(self):
+        with self.assertRaises(AssertionError) as exc:
+            self.assertHybridQueryBudget(Student.get_status, Student.objects.all(), max_queries=1)
+        self.assertIn('Student.get_status: 2 queries for 2 rows (scales linearly with row count)', f'{exc.exception}')
+
+        self.assertRaises(AssertionError, assert_hybrid_query_budget, Student.get_status, Student.objects.all())
+
+    def test_queryset(self):
+        self.assertHybridQueryBudget(Student.get_status, Student.objects.filter(id=self.student1.id), max_queries=1)
+        self.assertHybridQueryBudget(Student.get_status, Student.objects.none())
+
+    def test_measure_hybrid_queries(self):
+        report = measure_hybrid_queries(Student.get_status, Student.objects.all())
+        self.assertEqual((report.rows, report.queries, report.per_row_queries), (2, 2, [1, 1]))
+        self.assertTrue(report.scales_linearly)
+
+        report = measure_hybrid_queries(Student.get_status, Student.objects.filter(id=self.student1.id))
+        self.assertEqual((report.rows, report.queries), (1, 1))
+        self.assertFalse(report.scales_linearly)
+
+        report = measure_hybrid_queries(Student.magic_number1_times_n, None, n=2)
+        self.assertEqual((report.rows, report.queries), (2, 0))
+        self.assertFalse(report.scales_linearly)
+
+    def test_scales_linearly_by_growth(self):
+        def scales_linearly(per_row_queries):
+            return HybridQueryReport(Student.get_status, per_row_queries).scales_linearly
+
+        self.assertTrue(scales_linearly([1, 1, 1, 1]))
+        self.assertTrue(scales_linearly([1, 0, 1, 0, 1, 0]))  # Rows without relations skip their query
+        self.assertTrue(scales_linearly([0, 2, 0, 1]))
+        self.assertFalse(scales_linearly([3, 0, 0, 0]))  # Queries warming a cache
+        self.assertFalse(scales_linearly([1, 1, 1, 1, 0, 0, 0, 1]))
+        self.assertFalse(scales_linearly([0, 0]))
+        self.assertFalse(scales_linearly([1]))
+
+    def test_find_linear_hybrids(self):
+        reports = find_linear_hybrids(Student.full_name, Student.get_status, Student.magic_number1_times_n(2))
+        self.assertEqual([x.hybrid_expression.name for x in reports], ['get_status'])
@@ -0,0 +1,60 @@
+from django.db import models
+from django.test import TestCase
+
+from django_hybrid_attributes import HybridExpressionVariants
+from django_hybrid_attributes.core import _hybrid_value_alias
+
+from .models import Student
+
+
+class HybridExpressionVariantsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+
+    def test_aliases_are_deterministic(self):
+        variants = Student.magic_number1_times_n.many([1, 2, 3])
+        self.assertIsInstance(variants, HybridExpressionVariants)
+        self.assertEqual(len(variants), 3)
+        self.assertEqual(variants.aliases, {x: _hybrid_value_alias('magic_number1_times_n', (x,)) for x in (1, 2, 3)})
+        self.assertEqual(variants.aliases, Student.magic_number1_times_n.many([1, 2, 3]).aliases)
+
+    def test_values(self):
+        variants = Student.magic_number1_times_n.many(range(1, 51))
+        with self.assertNumQueries(1):
+            values = variants.values()
+        self.assertEqual(values[self.student1.pk], {x: x for x in range(1, 51)})
+        self.assertEqual(values[self.student2.pk], {x: 3 * x for x in range(1, 51)})
+
+        with self.assertNumQueries(1):
+            values = variants.values(Student.objects.filter(Student.full_name == 'Agent Smith'))
+        self.assertEqual(list(values), [self.student2.pk])
+
+    def test_filter_matches_any_variant(self):
+        variants = Student.magic_number1_times_n.many([2, 3])
+        self.assertEqual(list(Student.objects.filter(variants == 6).order_by('pk')), [self.student2])
+        self.assertEqual(list(Student.objects.filter(variants == 3).order_by('pk')), [self.student1])
+        self.assertEqual(list(Student.objects.filter(variants > 5).order_by('pk')), [self.student2])
+        self.assertEqual(list(Student.objects.filter(variants.l('in') == [2, 9]).order_by('pk')), [self.student1, self.student2])
+        self.assertEqual(list(Student.objects.filter(variants == 7)), [])
+
+        qs = Student.objects.filter(models.Q(magic_number1=1) | (variants == 9))
+        self.assertEqual(list(qs.order_by('pk')), [self.student1, self.student2])
+        self.assertEqual(str(qs.query).count(' WHERE '), 1)
+
+    def test_with_hybrids(self):
+        variants = Student.magic_number1_times_n.many([1, 2, 3])
+        students = list(Student.objects.with_hybrids(variants).order_by('pk'))
+        with self.assertNumQueries(0):
+            self.assertEqual([x.magic_number1_times_n(3) for x in students], [3, 9])
+        self.assertEqual(students[1]._hybrid_values[variants.aliases[2]], 6)
+
+    def test_annotate(self):
+        variants = Student.magic_number1_times_n.many([1, 10])
+        qs = Student.objects.annotate(variants).order_by('pk').values_list(*variants.aliases.values())
+        self.assertEqual(list(qs), [(1, 10), (3, 30)])
+
+    def test_extra_arguments(self):
+        variants = Student.magic_number1_times_n.many([1, 2], through='')
+        self.assertEqual(variants.values()[self.student2.pk], {1: 3, 2: 6})
@@ -0,0 +1,104 @@
+from unittest import skipUnless
+
+from django.db import models
+from django.test import TestCase
+
+from .models import Classroom, Student, StudentClassroom, Teacher
+
+
+@skipUnless(hasattr(models, 'Window'), 'Window functions require Django 2.0 or later')
+class WindowTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = Teacher.objects.create(first_name='Teacher', last_name='First')
+        self.classroom1 = Classroom.objects.create(name='Boring stuff', teacher=self.teacher)
+        self.classroom2 = Classroom.objects.create(name='IT and software development', teacher=self.teacher)
+        self.student1 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Filipe', last_name='Waitman')
+        self.student2 = Student.objects.create(magic_number1=3, magic_number2=4, first_name='Agent', last_name='Smith')
+        self.student3 = Student.objects.create(magic_number1=5, magic_number2=6, first_name='Another', last_name='One')
+        self.student4 = Student.objects.create(magic_number1=1, magic_number2=2, first_name='Tied', last_name='Student')
+        self.sc1 = StudentClassroom.objects.create(student=self.student1, classroom=self.classroom1, grade=5)
+        self.sc2 = StudentClassroom.objects.create(student=self.student2, classroom=self.classroom1, grade=9)
+        self.sc3 = StudentClassroom.objects.create(student=self.student3, classroom=self.classroom2, grade=7)
+        self.sc4 = StudentClassroom.objects.create(student=self.student1, classroom=self.classroom2, grade=8)
+
+    def test_rank_annotation(self):
+        qs = Student.objects.annotate(position=Student.magic_number_sum.rank(descending=True).e()).order_by('position', 'id')
+        self.assertEqual([(x.id, x.position) for x in qs], [
+            (self.student3.id, 1), (self.student2.id, 2), (self.student1.id, 3), (self.student4.id, 3),
+        ])
+
+    def test_row_number_annotation(self):
+        qs = Student.objects.annotate(position=Student.magic_number_sum.row_number().e()).order_by('position')
+        self.assertEqual([x.position for x in qs], [1, 2, 3, 4])
+        self.assertEqual([x.magic_number_sum for x in qs], [3, 3, 7, 11])
+
+    def test_running_sum_annotation(self):
+        qs = Student.objects.annotate(total=Student.magic_number_sum.running_sum(order_by='-id').e()).order_by('-id')
+        self.assertEqual([x.total for x in qs], [3, 14, 21, 24])
+
+        qs = StudentClassroom.objects.annotate(
+            total=StudentClassroom.get_grade_as_percent().running_sum(partition_by='classroom', order_by=['grade']).e()
+        ).order_by('classroom', 'grade')
+        self.assertEqual([round(x.total, 2) for x in qs], [0.5, 1.4, 0.7, 1.5])
+
+    def test_filter_top_n(self):
+        qs = Student.objects.filter(Student.magic_number_sum.rank(descending=True) <= 2)
+        self.assertEqual(set(qs), {self.student3, self.student2})
+
+        qs = Student.objects.filter(Student.magic_number_sum.rank() == 1)
+        self.assertEqual(set(qs), {self.student1, self.student4})
+
+        qs = Student.objects.filter(Student.magic_number_sum.row_number() > 3)
+        self.assertEqual(qs.count(), 1)
+
+    def test_filter_top_n_per_group(self):
+        # Best student (by magic_number_sum) of each classroom.
+        qs = StudentClassroom.objects.filter(
+            Student.magic_number_sum.t('student').rank(partition_by='classroom', descending=True) == 1
+        )
+        self.assertEqual(set(qs), {self.sc2, self.sc3})
+
+    def test_filter_window_is_computed_over_filtered_rows(self):
+        qs = Student.objects.filter(magic_number1__lt=5).filter(Student.magic_number_sum.rank(descending=True) == 1)
+        self.assertEqual(list(qs), [self.student2])
+
+    def test_exclude(self):
+        qs = Student.objects.filter(~Student.magic_number_sum.rank(descending=True) <= 2)
+        self.assertEqual(set(qs), {self.student1, self.student4})
+
+        qs = Student.objects.filter(Student.magic_number_sum.running_sum() != 3)
+        self.assertEqual(qs.count(), 3)
+
+        qs = Student.objects.exclude(Student.magic_number_sum.rank() == 1)
+        self.assertEqual(set(qs), {self.student2, self.student3})
+
+        qs = Student.objects.exclude(Student.magic_number_sum.rank(descending=True) != 1)
+        self.assertEqual(list(qs), [self.student3])
+
+    def test_filter_combined_with_other_filters(self):
+        qs = Student.objects.filter(
+            Student.magic_number_sum.rank(descending=True) <= 3,
+            Student.full_name.i().l('contains') == 'a',
+            models.Q(magic_number2__gt=2),
+        )
+        self.assertEqual(set(qs), {self.student2, self.student3})
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            Student.objects.filter(Student.magic_number_sum.rank().l('in') == [1, 2])
+
+        with self.assertRaises(TypeError):
+            Student.objects.filter(Student.magic_number_sum.rank() == Student.magic_number_sum)
+
+        with self.assertRaises(TypeError):
+            Student.objects.filter(Student.magic_number_sum.rank() == models.F('magic_number1'))
+
+        with self.assertRaises(TypeError):
+            Student.objects.filter(Student.magic_number_sum.rank() <= [1, 2])
+
+        with self.assertRaises(ValueError):
+            Student.objects.filter(models.Q(magic_number1=1) | (Student.magic_number_sum.rank() <= 2))
+
+        with self.assertRaises(AssertionError):
+            Student.magic_number_sum.rank().row_number()